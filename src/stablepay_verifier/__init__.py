@@ -8,10 +8,11 @@ __version__ = "0.1.0"
 __app_name__ = "stablepay"
 
 from stablepay_verifier.models import PaymentResult, PaymentStatus, VerifyRequest
-from stablepay_verifier.verifier import verify_payment
+from stablepay_verifier.verifier import verify_payment, verify_payment_async
 
 __all__ = [
     "verify_payment",
+    "verify_payment_async",
     "PaymentResult",
     "PaymentStatus",
     "VerifyRequest",
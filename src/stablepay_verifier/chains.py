@@ -2,7 +2,13 @@
 Chain and token configurations for StablePay Verifier.
 """
 
+import sys
+from datetime import timedelta
+from functools import lru_cache
+from typing import Any, Optional
+
 from stablepay_verifier.models import ChainConfig, TokenConfig
+from stablepay_verifier.utils import estimate_blocks_from_time, parse_time_window
 
 # Supported blockchain networks
 CHAINS: dict[str, ChainConfig] = {
@@ -12,6 +18,7 @@ CHAINS: dict[str, ChainConfig] = {
         default_rpc="https://polygon-rpc.com",
         block_time=2.0,
         explorer_url="https://polygonscan.com",
+        rpc_fallbacks=("https://polygon-bor-rpc.publicnode.com",),
     ),
     "ethereum": ChainConfig(
         name="Ethereum",
@@ -19,6 +26,7 @@ CHAINS: dict[str, ChainConfig] = {
         default_rpc="https://eth.llamarpc.com",
         block_time=12.0,
         explorer_url="https://etherscan.io",
+        rpc_fallbacks=("https://ethereum-rpc.publicnode.com",),
     ),
     "arbitrum": ChainConfig(
         name="Arbitrum One",
@@ -26,6 +34,7 @@ CHAINS: dict[str, ChainConfig] = {
         default_rpc="https://arb1.arbitrum.io/rpc",
         block_time=0.25,
         explorer_url="https://arbiscan.io",
+        rpc_fallbacks=("https://arbitrum-one-rpc.publicnode.com",),
     ),
     "base": ChainConfig(
         name="Base",
@@ -33,6 +42,7 @@ CHAINS: dict[str, ChainConfig] = {
         default_rpc="https://mainnet.base.org",
         block_time=2.0,
         explorer_url="https://basescan.org",
+        rpc_fallbacks=("https://base-rpc.publicnode.com",),
     ),
     "optimism": ChainConfig(
         name="Optimism",
@@ -40,6 +50,7 @@ CHAINS: dict[str, ChainConfig] = {
         default_rpc="https://mainnet.optimism.io",
         block_time=2.0,
         explorer_url="https://optimistic.etherscan.io",
+        rpc_fallbacks=("https://optimism-rpc.publicnode.com",),
     ),
 }
 
@@ -82,7 +93,7 @@ TOKENS: dict[str, dict[str, TokenConfig]] = {
         "DAI": TokenConfig(
             symbol="DAI",
             name="Dai Stablecoin",
-            address="0x6B175474E89094C44Da98b954EesfdC1D3709CEc",
+            address="0x6B175474E89094C44Da98b954EedeAC495271d0F",
             decimals=18,
         ),
     },
@@ -124,8 +135,20 @@ TOKENS: dict[str, dict[str, TokenConfig]] = {
     },
 }
 
+# Flat lookup tables with interned keys, built once at import time
+_CHAIN_BY_NAME: dict[str, ChainConfig] = {sys.intern(k): v for k, v in CHAINS.items()}
+_TOKEN_BY_PAIR: dict[tuple[str, str], TokenConfig] = {
+    (sys.intern(chain), sys.intern(symbol)): config
+    for chain, tokens in TOKENS.items()
+    for symbol, config in tokens.items()
+}
+
 # ERC20 Transfer event signature
 TRANSFER_EVENT_SIGNATURE = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+TRANSFER_EVENT_SIGNATURE_BYTES = bytes.fromhex(TRANSFER_EVENT_SIGNATURE[2:])
+
+# Maximum number of calls packed into one JSON-RPC batch request
+MAX_BATCH_SIZE = 20
 
 # ERC20 ABI (minimal for transfer events)
 ERC20_ABI = [
@@ -156,15 +179,22 @@ ERC20_ABI = [
 ]
 
 
+@lru_cache(maxsize=128)
 def get_chain_config(chain: str) -> ChainConfig | None:
     """Get chain configuration by name."""
-    return CHAINS.get(chain.lower())
+    return _CHAIN_BY_NAME.get(chain.lower())
 
 
+@lru_cache(maxsize=128)
 def get_token_config(chain: str, symbol: str) -> TokenConfig | None:
     """Get token configuration for a chain."""
-    chain_tokens = TOKENS.get(chain.lower(), {})
-    return chain_tokens.get(symbol.upper())
+    return _TOKEN_BY_PAIR.get((chain.lower(), symbol.upper()))
+
+
+def display_chain(chain: str) -> str:
+    """Get the display name for a chain, falling back to the given name."""
+    chain_config = get_chain_config(chain)
+    return chain_config.name if chain_config else chain
 
 
 def get_supported_chains() -> list[str]:
@@ -175,3 +205,67 @@ def get_supported_chains() -> list[str]:
 def get_supported_tokens(chain: str) -> list[str]:
     """Get list of supported tokens for a chain."""
     return list(TOKENS.get(chain.lower(), {}).keys())
+
+
+@lru_cache(maxsize=64)
+def window_to_block_count(chain: str, window: str | timedelta) -> int:
+    """
+    Estimate how many blocks a time window spans on a chain.
+    
+    Results are memoized, since only a handful of (chain, window) pairs
+    such as "1h", "24h" and "7d" are used in practice.
+    
+    Args:
+        chain: Chain name (e.g., "polygon")
+        window: Time window string (e.g., "24h") or an already parsed timedelta
+    
+    Returns:
+        Estimated number of blocks in the window
+    
+    Raises:
+        ValueError: If the chain is unknown or the window format is invalid
+    """
+    chain_config = get_chain_config(chain)
+    if chain_config is None:
+        raise ValueError(f"Unknown chain: {chain}")
+    if isinstance(window, str):
+        window = parse_time_window(window)
+    return estimate_blocks_from_time(window, chain_config.block_time)
+
+
+@lru_cache(maxsize=4096)
+def address_to_topic(address: str) -> str:
+    """Left-pad an address to a 32-byte event topic."""
+    return "0x" + address.lower().removeprefix("0x").rjust(64, "0")
+
+
+def make_getlogs_params(
+    token_address: str,
+    from_block: int,
+    to_block: int,
+    receiver: str,
+    sender: Optional[str] = None,
+) -> dict[str, Any]:
+    """
+    Build eth_getLogs filter params for Transfer events to a receiver.
+    
+    Args:
+        token_address: Token contract address
+        from_block: First block of the range (inclusive)
+        to_block: Last block of the range (inclusive)
+        receiver: Receiver address (topic[2])
+        sender: Optional sender address (topic[1])
+    
+    Returns:
+        Filter object ready to be sent as the eth_getLogs parameter
+    """
+    return {
+        "fromBlock": hex(from_block),
+        "toBlock": hex(to_block),
+        "address": token_address,
+        "topics": [
+            TRANSFER_EVENT_SIGNATURE,
+            address_to_topic(sender) if sender else None,
+            address_to_topic(receiver),
+        ],
+    }
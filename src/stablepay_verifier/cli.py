@@ -2,20 +2,17 @@
 CLI interface for StablePay Verifier.
 """
 
-import json
 import sys
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Optional
 
+import orjson
 import typer
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.text import Text
 
 from stablepay_verifier import __version__
 from stablepay_verifier.chains import (
     CHAINS,
     TOKENS,
+    display_chain,
     get_supported_chains,
     get_supported_tokens,
 )
@@ -23,14 +20,17 @@ from stablepay_verifier.models import PaymentStatus, VerifyRequest
 from stablepay_verifier.utils import format_address, format_amount, format_timestamp
 from stablepay_verifier.verifier import VerificationError, verify_payment
 
-# Initialize Typer app and Rich console
+if TYPE_CHECKING:
+    from rich.console import Console
+
+# Initialize Typer app; the Rich console is created on first use
 app = typer.Typer(
     name="stablepay",
     help="🔍 Verify stablecoin payments on-chain. No custody. No fees. Just truth.",
     no_args_is_help=True,
     rich_markup_mode="rich",
 )
-console = Console()
+_console: Optional["Console"] = None
 
 # Exit codes
 EXIT_PAID = 0
@@ -40,11 +40,29 @@ EXIT_PENDING = 3
 EXIT_ERROR = 10
 EXIT_RPC_ERROR = 11
 
+# Panel title and border color per status
+_STATUS_STYLES: dict[PaymentStatus, tuple[str, str]] = {
+    PaymentStatus.PAID: ("✅ PAYMENT VERIFIED", "green"),
+    PaymentStatus.NOT_PAID: ("❌ NOT PAID", "red"),
+    PaymentStatus.PARTIAL: ("⚠️ PARTIAL PAYMENT", "yellow"),
+    PaymentStatus.PENDING: ("⏳ PENDING CONFIRMATION", "yellow"),
+}
+
+
+def _get_console() -> "Console":
+    """Return the shared Rich console, importing Rich on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        
+        _console = Console()
+    return _console
+
 
 def version_callback(value: bool) -> None:
     """Show version and exit."""
     if value:
-        console.print(f"[bold blue]StablePay Verifier[/bold blue] v{__version__}")
+        _get_console().print(f"[bold blue]StablePay Verifier[/bold blue] v{__version__}")
         raise typer.Exit()
 
 
@@ -121,6 +139,11 @@ def verify(
         "--tolerance",
         help="Amount tolerance as decimal (0.01 = 1%%)",
     ),
+    verify_receipts: bool = typer.Option(
+        False,
+        "--verify-receipts",
+        help="Also check each transaction receipt succeeded (for non-standard tokens)",
+    ),
     output_format: str = typer.Option(
         "text",
         "--output",
@@ -163,6 +186,9 @@ def verify(
             time_window=time_window,
             min_confirmations=min_confirmations,
             tolerance=tolerance,
+            verify_receipts=verify_receipts,
+            # Quiet text output only prints the status
+            return_transfers=not (quiet and output_format == "text"),
         )
     except ValueError as e:
         _handle_error(str(e), "INVALID_INPUT", output_format, quiet)
@@ -170,7 +196,10 @@ def verify(
     
     # Show progress if not quiet
     if not quiet and output_format == "text":
-        console.print(f"\n[dim]Verifying {token} payment on {chain.title()}...[/dim]")
+        _get_console().print(
+            f"\n[dim]Verifying {request.token} payment on "
+            f"{display_chain(request.chain)}...[/dim]"
+        )
     
     # Perform verification
     try:
@@ -185,21 +214,14 @@ def verify(
     
     # Output results
     if output_format == "json":
-        _output_json(result)
+        _output_json(result, verbose)
     elif quiet:
         _output_quiet(result)
     else:
         _output_rich(result, verbose)
     
-    # Set exit code based on status
-    exit_code = {
-        PaymentStatus.PAID: EXIT_PAID,
-        PaymentStatus.NOT_PAID: EXIT_NOT_PAID,
-        PaymentStatus.PARTIAL: EXIT_PARTIAL,
-        PaymentStatus.PENDING: EXIT_PENDING,
-    }.get(result.status, EXIT_ERROR)
-    
-    raise typer.Exit(exit_code)
+    # Exit code mirrors the status value (PAID=0, NOT_PAID=1, ...)
+    raise typer.Exit(int(result.status))
 
 
 @app.command()
@@ -207,6 +229,9 @@ def info() -> None:
     """
     Show supported chains and tokens.
     """
+    from rich.table import Table
+    
+    console = _get_console()
     console.print("\n[bold blue]Supported Chains & Tokens[/bold blue]\n")
     
     for chain_name, chain_config in CHAINS.items():
@@ -236,14 +261,17 @@ def info() -> None:
 def _handle_error(message: str, code: str, output_format: str, quiet: bool) -> None:
     """Handle and display errors."""
     if output_format == "json":
-        console.print(json.dumps({
+        _write_json({
             "status": "ERROR",
             "error_code": code,
             "message": message,
-        }))
+        })
     elif quiet:
-        console.print(f"ERROR: {message}", style="red")
+        _get_console().print(f"ERROR: {message}", style="red")
     else:
+        from rich.panel import Panel
+        
+        console = _get_console()
         console.print()
         console.print(Panel(
             f"[red bold]Error:[/red bold] {message}\n\n"
@@ -253,15 +281,15 @@ def _handle_error(message: str, code: str, output_format: str, quiet: bool) -> N
         ))
 
 
-def _output_json(result) -> None:
+def _output_json(result, verbose: bool) -> None:
     """Output result as JSON."""
     output = {
-        "status": result.status.value,
+        "status": result.status.name,
         "expected_amount": result.expected_amount,
         "matched_amount": result.matched_amount,
         "transaction_hash": result.transaction_hash,
         "block_number": result.block_number,
-        "timestamp": result.timestamp.isoformat() if result.timestamp else None,
+        "timestamp": result.timestamp,
         "confirmations": result.confirmations,
         "sender": result.sender,
         "receiver": result.receiver,
@@ -269,33 +297,38 @@ def _output_json(result) -> None:
         "chain": result.chain,
         "transfer_count": len(result.transfers),
     }
-    console.print(json.dumps(output, indent=2))
+    if verbose:
+        output["transfers"] = [transfer.to_dict() for transfer in result.transfers]
+    _write_json(output)
+
+
+def _write_json(data: dict[str, Any]) -> None:
+    """Write data to stdout as indented JSON."""
+    sys.stdout.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NAIVE_UTC).decode())
+    sys.stdout.write("\n")
 
 
 def _output_quiet(result) -> None:
     """Output minimal status."""
-    console.print(result.status.value)
+    _get_console().print(result.status.name)
 
 
 def _output_rich(result, verbose: bool) -> None:
     """Output rich formatted result."""
+    from rich.panel import Panel
+    from rich.table import Table
+    
+    console = _get_console()
     console.print()
     
     # Determine status styling
-    status_styles = {
-        PaymentStatus.PAID: ("✅ PAYMENT VERIFIED", "green"),
-        PaymentStatus.NOT_PAID: ("❌ NOT PAID", "red"),
-        PaymentStatus.PARTIAL: ("⚠️ PARTIAL PAYMENT", "yellow"),
-        PaymentStatus.PENDING: ("⏳ PENDING CONFIRMATION", "yellow"),
-    }
-    
-    status_text, status_color = status_styles.get(
+    status_text, status_color = _STATUS_STYLES.get(
         result.status, ("❓ UNKNOWN", "dim")
     )
     
     # Build content
     lines = []
-    lines.append(f"[bold]Status:[/bold]        {result.status.value}")
+    lines.append(f"[bold]Status:[/bold]        {result.status.name}")
     lines.append(
         f"[bold]Amount:[/bold]        {format_amount(result.matched_amount)} {result.token} "
         f"[dim](expected: {format_amount(result.expected_amount)})[/dim]"
@@ -318,7 +351,7 @@ def _output_rich(result, verbose: bool) -> None:
         lines.append(f"[bold]Time:[/bold]          {format_timestamp(result.timestamp)}")
     
     # Show chain info
-    lines.append(f"[bold]Network:[/bold]       {result.chain.title()}")
+    lines.append(f"[bold]Network:[/bold]       {display_chain(result.chain)}")
     
     content = "\n".join(lines)
     
@@ -1,24 +1,31 @@
 """
-Pydantic models for StablePay Verifier.
+Data models for StablePay Verifier.
 """
 
-from datetime import datetime
-from enum import Enum
-from typing import Optional
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from enum import IntEnum
+from typing import Any, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_serializer, field_validator
 
+from stablepay_verifier.utils import is_valid_address, parse_time_window
 
-class PaymentStatus(str, Enum):
-    """Payment verification status."""
+
+class PaymentStatus(IntEnum):
+    """Payment verification status. Values double as CLI exit codes."""
+    
+    PAID = 0
+    NOT_PAID = 1
+    PARTIAL = 2
+    PENDING = 3
     
-    PAID = "PAID"
-    NOT_PAID = "NOT_PAID"
-    PARTIAL = "PARTIAL"
-    PENDING = "PENDING"
+    def __str__(self) -> str:
+        return self.name
 
 
-class ChainConfig(BaseModel):
+@dataclass(frozen=True, slots=True)
+class ChainConfig:
     """Configuration for a blockchain network."""
     
     name: str
@@ -26,18 +33,29 @@ class ChainConfig(BaseModel):
     default_rpc: str
     block_time: float = 2.0  # Average block time in seconds
     explorer_url: str = ""
+    rpc_fallbacks: tuple[str, ...] = ()  # Public RPCs tried when default_rpc fails
+    max_log_range: int = 2000  # Most blocks requested in a single eth_getLogs call
 
 
-class TokenConfig(BaseModel):
+@dataclass(frozen=True, slots=True)
+class TokenConfig:
     """Configuration for a token on a specific chain."""
     
     symbol: str
     name: str
     address: str
     decimals: int = 6
+    address_bytes: bytes = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        """Cache the raw 20-byte contract address for log comparisons."""
+        object.__setattr__(
+            self, "address_bytes", bytes.fromhex(self.address.removeprefix("0x"))
+        )
 
 
-class Transfer(BaseModel):
+@dataclass(slots=True)
+class Transfer:
     """Represents a single token transfer event."""
     
     tx_hash: str
@@ -48,62 +66,61 @@ class Transfer(BaseModel):
     raw_amount: int  # Raw amount in wei/smallest unit
     timestamp: Optional[datetime] = None
     confirmations: int = 0
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable dict of this transfer."""
+        data = asdict(self)
+        data["timestamp"] = self.timestamp.isoformat() if self.timestamp else None
+        return data
 
 
-class VerifyRequest(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class VerifyRequest:
     """Request parameters for payment verification."""
     
-    address: str = Field(..., description="Receiver wallet address")
-    amount: float = Field(..., gt=0, description="Expected payment amount")
-    token: str = Field(default="USDC", description="Token symbol")
-    chain: str = Field(default="polygon", description="Blockchain network")
-    rpc: Optional[str] = Field(default=None, description="Custom RPC endpoint")
-    sender: Optional[str] = Field(default=None, description="Filter by sender address")
-    time_window: str = Field(default="24h", description="Time window to search")
-    from_block: Optional[int] = Field(default=None, description="Starting block number")
-    to_block: Optional[int] = Field(default=None, description="Ending block number")
-    min_confirmations: int = Field(default=12, ge=0, description="Minimum confirmations")
-    tolerance: float = Field(default=0.01, ge=0, le=1, description="Amount tolerance (0.01 = 1%)")
-    
-    @field_validator("address", "sender", mode="before")
-    @classmethod
-    def validate_address(cls, v: Optional[str]) -> Optional[str]:
-        """Validate Ethereum address format."""
-        if v is None:
-            return None
-        v = v.strip()
-        if not v.startswith("0x") or len(v) != 42:
-            raise ValueError("Invalid address format. Expected 0x followed by 40 hex characters.")
-        try:
-            int(v, 16)
-        except ValueError:
-            raise ValueError("Invalid address format. Contains non-hexadecimal characters.")
-        return v.lower()
-    
-    @field_validator("chain", mode="before")
-    @classmethod
-    def validate_chain(cls, v: str) -> str:
-        """Normalize chain name."""
-        return v.lower().strip()
-    
-    @field_validator("token", mode="before")
-    @classmethod
-    def validate_token(cls, v: str) -> str:
-        """Normalize token symbol."""
-        return v.upper().strip()
+    address: str  # Receiver wallet address
+    amount: float  # Expected payment amount
+    token: str = "USDC"  # Token symbol
+    chain: str = "polygon"  # Blockchain network
+    rpc: Optional[str] = None  # Custom RPC endpoint
+    sender: Optional[str] = None  # Filter by sender address
+    time_window: str = "24h"  # Time window to search
+    from_block: Optional[int] = None  # Starting block number
+    to_block: Optional[int] = None  # Ending block number
+    min_confirmations: int = 12  # Minimum confirmations
+    tolerance: float = 0.01  # Amount tolerance (0.01 = 1%)
+    verify_receipts: bool = False  # Also check each transaction receipt succeeded
+    # Include every matched transfer in the result. When False, scanning stops as
+    # soon as the payment is covered, so matched_amount may not be the full total.
+    return_transfers: bool = True
+    time_window_td: timedelta = field(init=False, repr=False)  # Parsed time_window
     
-    @field_validator("time_window", mode="before")
-    @classmethod
-    def validate_time_window(cls, v: str) -> str:
-        """Validate time window format."""
-        v = v.lower().strip()
-        if not any(v.endswith(unit) for unit in ["h", "d", "m"]):
-            raise ValueError("Invalid time window format. Use: 1h, 24h, 7d, 30d")
-        try:
-            int(v[:-1])
-        except ValueError:
-            raise ValueError("Invalid time window format. Number must precede unit.")
-        return v
+    def __post_init__(self) -> None:
+        """Validate and normalize request fields."""
+        self.address = _normalize_address(self.address)
+        if self.sender is not None:
+            self.sender = _normalize_address(self.sender)
+        
+        if not self.amount > 0:
+            raise ValueError("Amount must be greater than 0.")
+        if self.min_confirmations < 0:
+            raise ValueError("Minimum confirmations must be 0 or greater.")
+        if not 0 <= self.tolerance <= 1:
+            raise ValueError("Tolerance must be between 0 and 1.")
+        
+        self.chain = self.chain.lower().strip()
+        self.token = self.token.upper().strip()
+        
+        self.time_window = self.time_window.lower().strip()
+        self.time_window_td = parse_time_window(self.time_window)
+
+
+def _normalize_address(v: str) -> str:
+    """Validate Ethereum address format and return it lowercased."""
+    v = v.strip()
+    if not is_valid_address(v):
+        raise ValueError("Invalid address format. Expected 0x followed by 40 hex characters.")
+    return v.lower()
 
 
 class PaymentResult(BaseModel):
@@ -123,6 +140,19 @@ class PaymentResult(BaseModel):
     transfers: list[Transfer] = Field(default_factory=list)
     error: Optional[str] = None
     
+    @field_validator("status", mode="before")
+    @classmethod
+    def parse_status_name(cls, v: Any) -> Any:
+        """Accept status labels such as "PAID", as written by model_dump_json."""
+        if isinstance(v, str) and v in PaymentStatus.__members__:
+            return PaymentStatus[v]
+        return v
+    
+    @field_serializer("status", when_used="json")
+    def serialize_status(self, status: PaymentStatus) -> str:
+        """Serialize the status by name, so JSON output stays "PAID" rather than 0."""
+        return status.name
+    
     @property
     def is_paid(self) -> bool:
         """Check if payment was verified."""
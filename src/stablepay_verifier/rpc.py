@@ -0,0 +1,302 @@
+"""
+RPC helpers for StablePay Verifier: concurrency, rate limiting, retries and failover.
+"""
+
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Optional, TypeVar
+
+import requests
+from requests.adapters import HTTPAdapter
+from tenacity import (
+    RetryCallState,
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    stop_after_delay,
+    wait_exponential,
+    wait_random,
+)
+from web3 import Web3
+from web3.exceptions import Web3Exception
+
+T = TypeVar("T")
+
+# Default client-side budget per RPC endpoint (requests per second / burst size)
+DEFAULT_RATE = 50.0
+DEFAULT_BURST = 100
+
+# Retry policy for transient RPC failures. Timeouts are not retried on the same
+# endpoint (RpcPool fails over instead), and retrying stops after MAX_RETRY_TIME.
+MAX_ATTEMPTS = 5
+MAX_RETRY_WAIT = 8.0
+MAX_RETRY_TIME = 20.0
+_TRANSIENT_STATUS = {429, 502, 503, 504}
+_TRANSIENT_MARKERS = ("rate", "limit", "429", "timeout", "502", "503")
+
+# Circuit breaker settings: open after N consecutive failures, retry after a cooldown
+FAILURE_THRESHOLD = 3
+BASE_COOLDOWN = 30.0
+MAX_COOLDOWN = 600.0
+
+# Circuit breaker states
+CLOSED = "CLOSED"
+OPEN = "OPEN"
+HALF_OPEN = "HALF_OPEN"
+
+# Shared pool for concurrent RPC calls
+RPC_WORKERS = 16
+RPC_EXECUTOR = ThreadPoolExecutor(max_workers=RPC_WORKERS, thread_name_prefix="stablepay-rpc")
+
+# Keep-alive connections held per host, sized so every RPC worker can have one open
+POOL_MAXSIZE = 2 * RPC_WORKERS
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting how fast requests are sent."""
+    
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_buckets: dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_rate_limiter(endpoint: str) -> TokenBucket:
+    """Get the shared token bucket for an RPC endpoint, creating it on first use."""
+    with _buckets_lock:
+        bucket = _buckets.get(endpoint)
+        if bucket is None:
+            bucket = _buckets[endpoint] = TokenBucket()
+        return bucket
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Check whether an RPC error is worth retrying (rate limits, timeouts, 5xx)."""
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        return exc.response.status_code in _TRANSIENT_STATUS
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(exc, Web3Exception):
+        message = str(exc).lower()
+        return any(marker in message for marker in _TRANSIENT_MARKERS)
+    return False
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """
+    Check whether call_rpc should retry an error on the same endpoint.
+    
+    Timeouts are transient but not retried: a hung endpoint would block for
+    the full request timeout on every attempt, and the query would be resent
+    unchanged. They are left to RpcPool to fail over.
+    """
+    return is_transient(exc) and not isinstance(exc, requests.Timeout)
+
+
+def _retry_after_seconds(exc: Optional[BaseException]) -> Optional[float]:
+    """Read the Retry-After header (in seconds) from an HTTP error, if present."""
+    response = getattr(exc, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+_backoff = wait_exponential(multiplier=0.25, max=MAX_RETRY_WAIT) + wait_random(0, 0.5)
+
+
+def _wait(retry_state: RetryCallState) -> float:
+    """Honor Retry-After when the server sends it, otherwise back off with jitter."""
+    exc = retry_state.outcome.exception() if retry_state.outcome else None
+    retry_after = _retry_after_seconds(exc)
+    if retry_after is not None:
+        return min(max(retry_after, 0.0), MAX_RETRY_WAIT)
+    return _backoff(retry_state)
+
+
+@retry(
+    wait=_wait,
+    stop=stop_after_attempt(MAX_ATTEMPTS) | stop_after_delay(MAX_RETRY_TIME),
+    retry=retry_if_exception(is_retryable),
+    reraise=True,
+)
+def call_rpc(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Call an RPC function, retrying transient failures with exponential backoff.
+    
+    Timeouts are raised straight away so the caller can fail over.
+    
+    Args:
+        fn: Function performing the RPC call (e.g. w3.eth.get_logs)
+        *args: Positional arguments for fn
+        **kwargs: Keyword arguments for fn
+    
+    Returns:
+        Whatever fn returns
+    
+    Raises:
+        The last exception from fn once retries are exhausted, or immediately
+        for non-transient errors
+    """
+    return fn(*args, **kwargs)
+
+
+def make_session() -> requests.Session:
+    """Create an HTTP session whose connection pool fits the RPC executor."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=RPC_WORKERS, pool_maxsize=POOL_MAXSIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def make_web3(url: str) -> Web3:
+    """Create a Web3 client for an HTTP RPC endpoint, with its own pooled session."""
+    # call_rpc owns retries, so web3's built-in retry layer is disabled
+    return Web3(Web3.HTTPProvider(
+        url,
+        request_kwargs={"timeout": 30},
+        session=make_session(),
+        exception_retry_configuration=None,
+    ))
+
+
+class RpcUnavailableError(Exception):
+    """Raised when every RPC endpoint is skipped by its circuit breaker."""
+
+
+@dataclass
+class Endpoint:
+    """An RPC endpoint with its client, rate limiter and circuit-breaker state."""
+    
+    url: str
+    w3: Web3  # Shared across threads; needs web3>=7.15 (per-context batches, shared session)
+    bucket: TokenBucket
+    state: str = CLOSED
+    failures: int = 0
+    opened_at: float = 0.0
+    cooldown: float = BASE_COOLDOWN
+
+
+class RpcPool:
+    """RPC endpoints guarded by circuit breakers, with ordered failover."""
+    
+    def __init__(
+        self,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        cooldown: float = BASE_COOLDOWN,
+    ):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._endpoints: dict[str, Endpoint] = {}
+        self._lock = threading.Lock()
+    
+    def get_endpoint(self, url: str) -> Endpoint:
+        """Get the endpoint for a URL, creating its client on first use."""
+        with self._lock:
+            endpoint = self._endpoints.get(url)
+            if endpoint is None:
+                endpoint = self._endpoints[url] = Endpoint(
+                    url=url,
+                    w3=make_web3(url),
+                    bucket=get_rate_limiter(url),
+                    cooldown=self.cooldown,
+                )
+            return endpoint
+    
+    def execute(self, urls: Sequence[str], call: Callable[[Endpoint], T]) -> T:
+        """
+        Run a call against the first available endpoint, failing over on errors.
+        
+        Endpoints whose breaker is open are skipped until their cooldown has
+        elapsed. Transient failures count against the endpoint and move on to
+        the next URL; any other error is raised straight away.
+        
+        Args:
+            urls: Endpoint URLs in order of preference
+            call: Function taking an Endpoint and performing the RPC work
+        
+        Returns:
+            Whatever call returns
+        
+        Raises:
+            The last transient error if every endpoint failed, or
+            RpcUnavailableError if every endpoint was skipped
+        """
+        last_error: Optional[Exception] = None
+        for url in urls:
+            endpoint = self.get_endpoint(url)
+            if not self._allow(endpoint):
+                continue
+            try:
+                result = call(endpoint)
+            except Exception as e:
+                if not is_transient(e):
+                    raise
+                self._record_failure(endpoint)
+                last_error = e
+                continue
+            self._record_success(endpoint)
+            return result
+        
+        if last_error is not None:
+            raise last_error
+        raise RpcUnavailableError(
+            f"All RPC endpoints are temporarily unavailable: {', '.join(urls)}"
+        )
+    
+    def _allow(self, endpoint: Endpoint) -> bool:
+        """Check the breaker, moving an open one to half-open after its cooldown."""
+        with self._lock:
+            if endpoint.state == OPEN:
+                if time.monotonic() - endpoint.opened_at < endpoint.cooldown:
+                    return False
+                endpoint.state = HALF_OPEN
+            return True
+    
+    def _record_success(self, endpoint: Endpoint) -> None:
+        with self._lock:
+            endpoint.state = CLOSED
+            endpoint.failures = 0
+            endpoint.cooldown = self.cooldown
+    
+    def _record_failure(self, endpoint: Endpoint) -> None:
+        with self._lock:
+            endpoint.failures += 1
+            if endpoint.state == HALF_OPEN:
+                # Trial call failed: reopen for twice as long
+                endpoint.cooldown = min(endpoint.cooldown * 2, MAX_COOLDOWN)
+            elif endpoint.failures < self.failure_threshold:
+                return
+            endpoint.state = OPEN
+            endpoint.opened_at = time.monotonic()
+
+
+# Shared pool used by the verifier
+RPC_POOL = RpcPool()
@@ -3,9 +3,19 @@ Utility functions for StablePay Verifier.
 """
 
 import re
+import time
 from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from functools import lru_cache
 
+_HEX_CHARS = b"0123456789abcdefABCDEF"
+_TW_RE = re.compile(r"^(\d+)([hdm])$")
 
+# Powers of ten for every decimals value an ERC20 token can realistically use
+_POW10 = tuple(10**i for i in range(37))
+
+
+@lru_cache(maxsize=256)
 def parse_time_window(window: str) -> timedelta:
     """
     Parse a time window string into a timedelta.
@@ -20,7 +30,7 @@ def parse_time_window(window: str) -> timedelta:
         ValueError: If the format is invalid
     """
     window = window.lower().strip()
-    match = re.match(r"^(\d+)([hdm])$", window)
+    match = _TW_RE.match(window)
     
     if not match:
         raise ValueError(f"Invalid time window format: {window}. Use: 1h, 24h, 7d, 30m")
@@ -52,8 +62,9 @@ def estimate_blocks_from_time(
     Returns:
         Estimated number of blocks
     """
-    total_seconds = time_delta.total_seconds()
-    return max(1, int(total_seconds / block_time_seconds))
+    total_ms = time_delta // timedelta(milliseconds=1)
+    block_ms = max(1, round(block_time_seconds * 1000))
+    return max(1, total_ms // block_ms)
 
 
 def format_address(address: str, length: int = 8) -> str:
@@ -83,9 +94,18 @@ def format_amount(amount: float, decimals: int = 2) -> str:
     Returns:
         Formatted amount string
     """
+    # -0.0 and 0.0 share a cache key but format differently, so zero skips the cache
+    if decimals == 2 and amount != 0:
+        return _format_amount_2dp(amount)
     return f"{amount:,.{decimals}f}"
 
 
+@lru_cache(maxsize=4096)
+def _format_amount_2dp(amount: float) -> str:
+    """Format an amount with two decimals; cached since round amounts repeat."""
+    return f"{amount:,.2f}"
+
+
 def wei_to_token(wei_amount: int, decimals: int = 6) -> float:
     """
     Convert wei/smallest unit to token amount.
@@ -97,7 +117,7 @@ def wei_to_token(wei_amount: int, decimals: int = 6) -> float:
     Returns:
         Human-readable token amount
     """
-    return wei_amount / (10 ** decimals)
+    return wei_amount / _POW10[decimals]
 
 
 def token_to_wei(token_amount: float, decimals: int = 6) -> int:
@@ -111,7 +131,7 @@ def token_to_wei(token_amount: float, decimals: int = 6) -> int:
     Returns:
         Amount in smallest unit
     """
-    return int(token_amount * (10 ** decimals))
+    return int(Decimal(str(token_amount)) * _POW10[decimals])
 
 
 def is_valid_address(address: str) -> bool:
@@ -124,26 +144,25 @@ def is_valid_address(address: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    if not address or not isinstance(address, str):
+    if not isinstance(address, str):
         return False
-    
     address = address.strip()
-    if not address.startswith("0x"):
-        return False
-    
-    if len(address) != 42:
-        return False
-    
-    try:
-        int(address, 16)
-        return True
-    except ValueError:
-        return False
+    return address.startswith("0x") and len(address) == 42 and _is_hex(address[2:])
+
+
+def _is_hex(value: str) -> bool:
+    """Check that a string contains only hexadecimal digits."""
+    return value.isascii() and not value.encode("ascii").translate(None, _HEX_CHARS)
+
+
+def utc_now_seconds() -> float:
+    """Get current UTC time as seconds since the epoch."""
+    return time.time()
 
 
 def get_utc_now() -> datetime:
     """Get current UTC datetime."""
-    return datetime.now(timezone.utc)
+    return datetime.fromtimestamp(time.time(), timezone.utc)
 
 
 def format_timestamp(dt: datetime | None) -> str:
@@ -177,3 +196,21 @@ def calculate_tolerance_range(
     """
     tolerance_amount = amount * tolerance_percent
     return (amount - tolerance_amount, amount + tolerance_amount)
+
+
+def calculate_tolerance_range_wei(
+    amount_wei: int,
+    tolerance_ppm: int = 10_000
+) -> tuple[int, int]:
+    """
+    Calculate the acceptable payment range in smallest token units.
+    
+    Args:
+        amount_wei: Expected amount in smallest unit
+        tolerance_ppm: Tolerance in parts per million (10_000 = 1%)
+    
+    Returns:
+        Tuple of (minimum acceptable, maximum acceptable)
+    """
+    tolerance_amount = amount_wei * tolerance_ppm // 1_000_000
+    return (amount_wei - tolerance_amount, amount_wei + tolerance_amount)
@@ -2,17 +2,27 @@
 Core payment verification logic for StablePay Verifier.
 """
 
+import asyncio
+import threading
+from concurrent.futures import CancelledError, as_completed
+from dataclasses import astuple
 from datetime import datetime, timezone
-from typing import Optional
+from functools import lru_cache, partial
+from typing import Any, Optional
 
+import requests
+from cachetools import TTLCache
 from web3 import Web3
 from web3.exceptions import Web3Exception
 
 from stablepay_verifier.chains import (
     ERC20_ABI,
-    TRANSFER_EVENT_SIGNATURE,
+    MAX_BATCH_SIZE,
+    TRANSFER_EVENT_SIGNATURE_BYTES,
     get_chain_config,
     get_token_config,
+    make_getlogs_params,
+    window_to_block_count,
 )
 from stablepay_verifier.models import (
     PaymentResult,
@@ -20,12 +30,38 @@ from stablepay_verifier.models import (
     Transfer,
     VerifyRequest,
 )
+from stablepay_verifier.rpc import (
+    RPC_EXECUTOR,
+    RPC_POOL,
+    RpcUnavailableError,
+    TokenBucket,
+    call_rpc,
+    is_transient,
+)
 from stablepay_verifier.utils import (
-    estimate_blocks_from_time,
-    parse_time_window,
+    calculate_tolerance_range_wei,
+    token_to_wei,
     wei_to_token,
 )
 
+# Receipts and block timestamps of confirmed transfers don't change, so reuse them
+# across calls. Only the timestamp of a block is kept, not the block itself.
+_receipt_cache: TTLCache = TTLCache(maxsize=10_000, ttl=3600)
+_timestamp_cache: TTLCache = TTLCache(maxsize=10_000, ttl=3600)
+_cache_lock = threading.Lock()
+
+# PAID results are reused briefly for identical requests (e.g. a checkout page and a
+# webhook checking the same order). Other statuses can change with the next block,
+# so they are always re-checked.
+_RESULT_CACHE_TTL = 10
+_result_cache: TTLCache = TTLCache(maxsize=256, ttl=_RESULT_CACHE_TTL)
+
+# Largest block range a single verification will search
+MAX_BLOCK_RANGE = 100_000
+
+# Transfers below 1/1000th of the accepted amount have their receipts checked last
+DUST_DIVISOR = 1000
+
 
 class VerificationError(Exception):
     """Custom exception for verification errors."""
@@ -40,6 +76,9 @@ def verify_payment(request: VerifyRequest) -> PaymentResult:
     """
     Verify a stablecoin payment on-chain.
     
+    A PAID result is reused for identical requests made within a few seconds;
+    each caller gets its own deep copy.
+    
     Args:
         request: VerifyRequest with payment details
     
@@ -49,6 +88,21 @@ def verify_payment(request: VerifyRequest) -> PaymentResult:
     Raises:
         VerificationError: If verification fails due to configuration or network issues
     """
+    key = astuple(request)
+    with _cache_lock:
+        cached = _result_cache.get(key)
+    if cached is not None:
+        return cached.model_copy(deep=True)
+    
+    result = _verify_payment(request)
+    if result.status == PaymentStatus.PAID:
+        with _cache_lock:
+            _result_cache[key] = result.model_copy(deep=True)
+    return result
+
+
+def _verify_payment(request: VerifyRequest) -> PaymentResult:
+    """Verify a payment against the chain, without the result cache."""
     # Get chain configuration
     chain_config = get_chain_config(request.chain)
     if chain_config is None:
@@ -67,27 +121,34 @@ def verify_payment(request: VerifyRequest) -> PaymentResult:
             code="UNSUPPORTED_TOKEN"
         )
     
-    # Connect to RPC
-    rpc_url = request.rpc or chain_config.default_rpc
-    try:
-        w3 = Web3(Web3.HTTPProvider(rpc_url, request_kwargs={"timeout": 30}))
-        if not w3.is_connected():
-            raise VerificationError(
-                f"Failed to connect to RPC endpoint: {rpc_url}",
-                code="RPC_ERROR"
-            )
-    except Exception as e:
-        raise VerificationError(
-            f"RPC connection error: {str(e)}",
-            code="RPC_ERROR"
-        )
+    # Prepare address for event filtering
+    receiver_address = _to_checksum(request.address)
+    token_address = _to_checksum(token_config.address)
+    
+    sender_address = _to_checksum(request.sender) if request.sender else None
+    
+    # Reject ranges that are too large before any RPC round-trip, where that can
+    # be known locally (explicit bounds, or a time window ending at the chain head)
+    blocks_to_search = window_to_block_count(request.chain, request.time_window_td)
+    if request.from_block is not None and request.to_block is not None:
+        _check_block_range(request.to_block - request.from_block)
+    elif request.from_block is None and request.to_block is None:
+        _check_block_range(blocks_to_search)
     
-    # Determine block range
+    # RPC endpoints in failover order; a custom RPC is used alone to keep queries private
+    if request.rpc:
+        rpc_urls = [request.rpc]
+    else:
+        rpc_urls = [chain_config.default_rpc, *chain_config.rpc_fallbacks]
+    
+    # Determine block range (this is also the first contact with the RPC)
     try:
-        current_block = w3.eth.block_number
-    except Web3Exception as e:
+        current_block = RPC_POOL.execute(
+            rpc_urls, lambda endpoint: call_rpc(endpoint.w3.eth.get_block_number)
+        )
+    except (Web3Exception, requests.RequestException, RpcUnavailableError) as e:
         raise VerificationError(
-            f"Failed to get current block number: {str(e)}",
+            f"RPC connection error: {str(e)}",
             code="RPC_ERROR"
         )
     
@@ -95,53 +156,30 @@ def verify_payment(request: VerifyRequest) -> PaymentResult:
     if request.from_block is not None:
         from_block = request.from_block
     else:
-        time_delta = parse_time_window(request.time_window)
-        blocks_to_search = estimate_blocks_from_time(time_delta, chain_config.block_time)
         from_block = max(0, current_block - blocks_to_search)
     
     to_block = request.to_block or current_block
-    
-    # Validate block range
-    max_block_range = 100000
-    if to_block - from_block > max_block_range:
-        raise VerificationError(
-            f"Block range too large ({to_block - from_block} blocks). "
-            f"Maximum is {max_block_range} blocks. Narrow your search.",
-            code="RANGE_TOO_LARGE"
-        )
-    
-    # Prepare address for event filtering
-    receiver_address = Web3.to_checksum_address(request.address)
-    token_address = Web3.to_checksum_address(token_config.address)
-    
-    # Build event filter for Transfer events
-    # Transfer(address indexed from, address indexed to, uint256 value)
-    # Topic[0] = event signature
-    # Topic[1] = from address (optional filter)
-    # Topic[2] = to address (our receiver)
-    
-    topics = [
-        TRANSFER_EVENT_SIGNATURE,  # Transfer event signature
-        None,  # from: any sender (or filtered below)
-        "0x" + receiver_address[2:].lower().zfill(64),  # to: our receiver (padded)
-    ]
-    
-    # Add sender filter if specified
-    if request.sender:
-        sender_address = Web3.to_checksum_address(request.sender)
-        topics[1] = "0x" + sender_address[2:].lower().zfill(64)
+    _check_block_range(to_block - from_block)
     
     # Fetch Transfer events
+    log_filter = make_getlogs_params(
+        token_address, from_block, to_block, receiver_address, sender_address
+    )
     try:
-        logs = w3.eth.get_logs({
-            "address": token_address,
-            "topics": topics,
-            "fromBlock": from_block,
-            "toBlock": to_block,
-        })
-    except Web3Exception as e:
+        logs = RPC_POOL.execute(
+            rpc_urls,
+            lambda endpoint: _get_logs(
+                endpoint.w3,
+                endpoint.bucket,
+                log_filter,
+                from_block,
+                to_block,
+                chain_config.max_log_range,
+            ),
+        )
+    except (Web3Exception, requests.RequestException, RpcUnavailableError) as e:
         error_msg = str(e).lower()
-        if "rate" in error_msg or "limit" in error_msg:
+        if "rate" in error_msg or "limit" in error_msg or "429" in error_msg:
             raise VerificationError(
                 "RPC rate limit exceeded. Try again later or use a custom RPC endpoint.",
                 code="RATE_LIMITED"
@@ -151,92 +189,147 @@ def verify_payment(request: VerifyRequest) -> PaymentResult:
             code="RPC_ERROR"
         )
     
-    # Process transfer logs
+    # Don't trust the node to have applied the filter: keep only Transfer events
+    # emitted by the token contract to the receiver, compared as raw bytes
+    receiver_bytes = bytes.fromhex(request.address[2:])
+    logs = [
+        log for log in logs
+        if _is_transfer_to(log, token_config.address_bytes, receiver_bytes)
+    ]
+    
+    # Amounts are compared in smallest token units
+    expected_raw = token_to_wei(request.amount, token_config.decimals)
+    min_acceptable_raw, _ = calculate_tolerance_range_wei(
+        expected_raw, round(request.tolerance * 1_000_000)
+    )
+    
+    # Standard ERC-20 tokens only emit Transfer when the transfer succeeds, so the
+    # log itself is enough evidence unless the caller asks for receipt checks.
+    last_confirmed_block = current_block - request.min_confirmations
+    confirmed_logs = [log for log in logs if log["blockNumber"] <= last_confirmed_block]
     transfers: list[Transfer] = []
-    total_received = 0
+    confirmed_raw = 0
+    pending_raw = 0
+    latest: Optional[tuple[Any, int]] = None  # (log, raw_amount) of latest confirmed
+    decimals = token_config.decimals
+    receiver = request.address
     
-    for log in logs:
-        # Decode the transfer amount from data
-        raw_amount = int(log["data"].hex(), 16)
-        amount = wei_to_token(raw_amount, token_config.decimals)
-        
-        # Get sender from topics[1]
-        sender_topic = log["topics"][1].hex()
-        sender = Web3.to_checksum_address("0x" + sender_topic[-40:])
-        
-        # Calculate confirmations
-        block_number = log["blockNumber"]
-        confirmations = current_block - block_number
+    if request.return_transfers:
+        # Fetch blocks (and receipts, if requested) for all confirmed logs up front
+        receipts_by_hash, timestamps = _fetch_details(
+            rpc_urls,
+            request.chain,
+            _unique_tx_hashes(confirmed_logs) if request.verify_receipts else [],
+            list(dict.fromkeys(log["blockNumber"] for log in confirmed_logs)),
+        )
         
-        # Skip if not enough confirmations
-        if confirmations < request.min_confirmations:
-            # Still add to transfers but mark as pending
-            transfers.append(Transfer(
-                tx_hash=log["transactionHash"].hex(),
-                block_number=block_number,
-                sender=sender.lower(),
-                receiver=receiver_address.lower(),
-                amount=amount,
-                raw_amount=raw_amount,
-                confirmations=confirmations,
+        # Process transfer logs, tracking totals and the latest confirmed transfer
+        for log in logs:
+            # Decode the transfer amount from data
+            raw_amount = int.from_bytes(log["data"], "big")
+            block_number = log["blockNumber"]
+            
+            # Skip if not enough confirmations
+            if block_number > last_confirmed_block:
+                # Still add to transfers but mark as pending
+                transfers.append(
+                    _to_transfer(log, raw_amount, decimals, receiver, current_block)
+                )
+                pending_raw += raw_amount
+                continue
+            
+            # Verify transaction success
+            if request.verify_receipts:
+                receipt = receipts_by_hash.get(log["transactionHash"])
+                if receipt is None or receipt["status"] != 1:
+                    continue  # Skip failed transactions or missing receipts
+            
+            transfers.append(_to_transfer(
+                log, raw_amount, decimals, receiver, current_block,
+                timestamps.get(block_number),
             ))
-            continue
-        
-        # Verify transaction success
-        try:
-            receipt = w3.eth.get_transaction_receipt(log["transactionHash"])
-            if receipt["status"] != 1:
-                continue  # Skip failed transactions
-        except Web3Exception:
-            continue  # Skip if we can't get receipt
-        
-        # Get block timestamp
-        try:
-            block = w3.eth.get_block(block_number)
-            timestamp = datetime.fromtimestamp(block["timestamp"], tz=timezone.utc)
-        except Web3Exception:
-            timestamp = None
+            confirmed_raw += raw_amount
+            if latest is None or block_number > latest[0]["blockNumber"]:
+                latest = (log, raw_amount)
+    else:
+        # Only the status and latest transfer are needed, so only the latest
+        # transfer's block is fetched, for its timestamp
+        pending_raw = sum(
+            int.from_bytes(log["data"], "big")
+            for log in logs if log["blockNumber"] > last_confirmed_block
+        )
+        candidates = [(log, int.from_bytes(log["data"], "big")) for log in confirmed_logs]
+        if not request.verify_receipts:
+            confirmed_raw = sum(raw_amount for _, raw_amount in candidates)
+            if candidates:
+                latest = max(candidates, key=lambda item: item[0]["blockNumber"])
+        else:
+            # Check receipts newest first, a batch at a time, until the payment is
+            # covered and no newer transfer could still be the latest one. Dust
+            # transfers (often address-poisoning spam) cannot realistically cover
+            # the payment, so their receipts are checked last, and once it is
+            # covered only for dust newer than the latest transfer.
+            def settled(log: Any) -> bool:
+                return (
+                    confirmed_raw >= min_acceptable_raw and latest is not None
+                    and log["blockNumber"] <= latest[0]["blockNumber"]
+                )
+            
+            dust_raw = min_acceptable_raw // DUST_DIVISOR
+            candidates.sort(key=lambda item: item[0]["blockNumber"], reverse=True)
+            for group in (
+                [item for item in candidates if item[1] >= dust_raw],
+                [item for item in candidates if item[1] < dust_raw],
+            ):
+                for start in range(0, len(group), MAX_BATCH_SIZE):
+                    batch = [
+                        item for item in group[start:start + MAX_BATCH_SIZE]
+                        if not settled(item[0])
+                    ]
+                    if not batch:
+                        break  # The rest of the group is older still
+                    receipts_by_hash, _ = _fetch_details(
+                        rpc_urls, request.chain, _unique_tx_hashes([log for log, _ in batch]), []
+                    )
+                    for log, raw_amount in batch:
+                        if settled(log):
+                            break
+                        receipt = receipts_by_hash.get(log["transactionHash"])
+                        if receipt is None or receipt["status"] != 1:
+                            continue  # Skip failed transactions or missing receipts
+                        confirmed_raw += raw_amount
+                        if latest is None or log["blockNumber"] > latest[0]["blockNumber"]:
+                            latest = (log, raw_amount)
         
-        transfer = Transfer(
-            tx_hash=log["transactionHash"].hex(),
-            block_number=block_number,
-            sender=sender.lower(),
-            receiver=receiver_address.lower(),
-            amount=amount,
-            raw_amount=raw_amount,
-            timestamp=timestamp,
-            confirmations=confirmations,
+        timestamps = {}
+        if latest is not None:
+            _, timestamps = _fetch_details(
+                rpc_urls, request.chain, [], [latest[0]["blockNumber"]]
+            )
+    
+    latest_transfer: Optional[Transfer] = None
+    if latest is not None:
+        latest_log, latest_raw = latest
+        latest_transfer = _to_transfer(
+            latest_log, latest_raw, decimals, receiver, current_block,
+            timestamps.get(latest_log["blockNumber"]),
         )
-        transfers.append(transfer)
-        total_received += amount
     
     # Determine payment status
-    tolerance_amount = request.amount * request.tolerance
-    min_acceptable = request.amount - tolerance_amount
-    
-    # Check for pending transfers (not enough confirmations)
-    pending_amount = sum(t.amount for t in transfers if t.confirmations < request.min_confirmations)
-    confirmed_amount = total_received
-    
-    if confirmed_amount >= min_acceptable:
+    if confirmed_raw >= min_acceptable_raw:
         status = PaymentStatus.PAID
-    elif confirmed_amount > 0:
+    elif confirmed_raw > 0:
         status = PaymentStatus.PARTIAL
-    elif pending_amount >= min_acceptable:
+    elif pending_raw >= min_acceptable_raw:
         status = PaymentStatus.PENDING
     else:
         status = PaymentStatus.NOT_PAID
     
-    # Get the most recent confirmed transfer for result details
-    confirmed_transfers = [t for t in transfers if t.confirmations >= request.min_confirmations]
-    latest_transfer: Optional[Transfer] = None
-    if confirmed_transfers:
-        latest_transfer = max(confirmed_transfers, key=lambda t: t.block_number)
-    
-    return PaymentResult(
+    # Every field was built (and typed) above, so skip Pydantic validation
+    return PaymentResult.model_construct(
         status=status,
         expected_amount=request.amount,
-        matched_amount=confirmed_amount,
+        matched_amount=wei_to_token(confirmed_raw, token_config.decimals),
         transaction_hash=latest_transfer.tx_hash if latest_transfer else None,
         block_number=latest_transfer.block_number if latest_transfer else None,
         timestamp=latest_transfer.timestamp if latest_transfer else None,
@@ -247,3 +340,331 @@ def verify_payment(request: VerifyRequest) -> PaymentResult:
         chain=request.chain,
         transfers=transfers,
     )
+
+
+async def verify_payment_async(request: VerifyRequest) -> PaymentResult:
+    """
+    Verify a stablecoin payment on-chain without blocking the event loop.
+    
+    Runs verify_payment in a worker thread, so async applications can await
+    several verifications concurrently. The RPC work inside each verification
+    is already batched and parallelized on the shared RPC executor.
+    
+    Args:
+        request: VerifyRequest with payment details
+    
+    Returns:
+        PaymentResult with verification status and details
+    
+    Raises:
+        VerificationError: If verification fails due to configuration or network issues
+    """
+    return await asyncio.to_thread(verify_payment, request)
+
+
+def _check_block_range(block_count: int) -> None:
+    """Raise a VerificationError if a block range is too large to search."""
+    if block_count > MAX_BLOCK_RANGE:
+        raise VerificationError(
+            f"Block range too large ({block_count} blocks). "
+            f"Maximum is {MAX_BLOCK_RANGE} blocks. Narrow your search.",
+            code="RANGE_TOO_LARGE"
+        )
+
+
+def _is_transfer_to(log: Any, token_address: bytes, receiver: bytes) -> bool:
+    """Check a log is a Transfer event from token_address to receiver."""
+    topics = log["topics"]
+    return (
+        len(topics) == 3
+        and bytes(topics[0]) == TRANSFER_EVENT_SIGNATURE_BYTES
+        and bytes(topics[2])[-20:] == receiver
+        and bytes.fromhex(log["address"][2:]) == token_address
+    )
+
+
+def _unique_tx_hashes(logs: list[Any]) -> list[Any]:
+    """Get the distinct transaction hashes of logs, in order."""
+    return list(dict.fromkeys(log["transactionHash"] for log in logs))
+
+
+def _fetch_details(
+    rpc_urls: list[str],
+    chain: str,
+    tx_hashes: list[Any],
+    block_numbers: list[int],
+) -> tuple[dict[Any, Any], dict[int, datetime]]:
+    """
+    Get receipts and block timestamps, failing over between RPC endpoints.
+    
+    Args:
+        rpc_urls: Endpoint URLs in order of preference
+        chain: Chain name, used to scope the caches
+        tx_hashes: Unique transaction hashes to get receipts for
+        block_numbers: Unique block numbers to get timestamps for
+    
+    Returns:
+        Tuple of (receipts keyed by tx hash, UTC timestamps keyed by block number)
+    
+    Raises:
+        VerificationError: If the details cannot be fetched from any endpoint
+    """
+    if not tx_hashes and not block_numbers:
+        return {}, {}
+    try:
+        receipts, timestamps = RPC_POOL.execute(
+            rpc_urls,
+            lambda endpoint: _get_receipts_and_timestamps(
+                endpoint.w3, endpoint.bucket, chain, tx_hashes, block_numbers
+            ),
+        )
+    except (Web3Exception, requests.RequestException, RpcUnavailableError) as e:
+        raise VerificationError(
+            f"Failed to fetch transaction details: {str(e)}",
+            code="RPC_ERROR"
+        )
+    # Convert each block timestamp once, however many transfers share the block
+    return receipts, {
+        number: datetime.fromtimestamp(timestamp, tz=timezone.utc)
+        for number, timestamp in timestamps.items()
+    }
+
+
+def _to_transfer(
+    log: Any,
+    raw_amount: int,
+    decimals: int,
+    receiver: str,
+    current_block: int,
+    timestamp: Optional[datetime] = None,
+) -> Transfer:
+    """Build a Transfer from a decoded Transfer event log."""
+    block_number = log["blockNumber"]
+    return Transfer(
+        tx_hash=log["transactionHash"].to_0x_hex(),
+        block_number=block_number,
+        # The sender address is the last 20 bytes of topics[1]
+        sender="0x" + bytes(log["topics"][1])[-20:].hex(),
+        receiver=receiver,
+        amount=wei_to_token(raw_amount, decimals),
+        raw_amount=raw_amount,
+        timestamp=timestamp,
+        confirmations=current_block - block_number,
+    )
+
+
+@lru_cache(maxsize=4096)
+def _to_checksum(address: str) -> str:
+    """Checksum an address, caching the keccak work for repeat addresses."""
+    return Web3.to_checksum_address(address)
+
+
+def _get_logs(
+    w3: Web3,
+    bucket: TokenBucket,
+    log_filter: dict[str, Any],
+    from_block: int,
+    to_block: int,
+    max_range: int,
+) -> list[Any]:
+    """
+    Get logs for a block range, split into chunks the RPC will accept.
+    
+    Many providers cap eth_getLogs at a few thousand blocks, so larger ranges
+    are fetched as concurrent requests of at most max_range blocks each.
+    
+    Args:
+        w3: Connected Web3 instance
+        bucket: Rate limiter for the RPC endpoint
+        log_filter: Filter from make_getlogs_params (its block range is split here)
+        from_block: First block of the range (inclusive)
+        to_block: Last block of the range (inclusive)
+        max_range: Most blocks to request in a single call
+    
+    Returns:
+        Matching logs in block order
+    """
+    filters = [
+        {
+            **log_filter,
+            "fromBlock": hex(start),
+            "toBlock": hex(min(start + max_range - 1, to_block)),
+        }
+        for start in range(from_block, to_block + 1, max_range)
+    ]
+    if len(filters) <= 1:
+        return list(_rate_limited_call(bucket, w3.eth.get_logs, {
+            **log_filter, "fromBlock": hex(from_block), "toBlock": hex(to_block),
+        }))
+    
+    logs: list[Any] = []
+    for chunk in RPC_EXECUTOR.map(
+        lambda f: _rate_limited_call(bucket, w3.eth.get_logs, f), filters
+    ):
+        logs.extend(chunk)
+    return logs
+
+
+def _get_receipts_and_timestamps(
+    w3: Web3,
+    bucket: TokenBucket,
+    chain: str,
+    tx_hashes: list[Any],
+    block_numbers: list[int],
+) -> tuple[dict[Any, Any], dict[int, int]]:
+    """
+    Get receipts and block timestamps, only fetching those not already cached.
+    
+    Args:
+        w3: Connected Web3 instance
+        bucket: Rate limiter for the RPC endpoint
+        chain: Chain name, used to scope the caches
+        tx_hashes: Unique transaction hashes to get receipts for
+        block_numbers: Unique block numbers to get timestamps for
+    
+    Returns:
+        Tuple of (receipts keyed by tx hash, Unix timestamps keyed by block number)
+    """
+    receipts: dict[Any, Any] = {}
+    timestamps: dict[int, int] = {}
+    with _cache_lock:
+        for tx_hash in tx_hashes:
+            receipt = _receipt_cache.get((chain, tx_hash))
+            if receipt is not None:
+                receipts[tx_hash] = receipt
+        for block_number in block_numbers:
+            timestamp = _timestamp_cache.get((chain, block_number))
+            if timestamp is not None:
+                timestamps[block_number] = timestamp
+    
+    fetched_receipts, fetched_blocks = _fetch_receipts_and_blocks(
+        w3,
+        bucket,
+        [h for h in tx_hashes if h not in receipts],
+        [n for n in block_numbers if n not in timestamps],
+    )
+    fetched_timestamps = {
+        block_number: block["timestamp"] for block_number, block in fetched_blocks.items()
+    }
+    
+    with _cache_lock:
+        for tx_hash, receipt in fetched_receipts.items():
+            _receipt_cache[(chain, tx_hash)] = receipt
+        for block_number, timestamp in fetched_timestamps.items():
+            _timestamp_cache[(chain, block_number)] = timestamp
+    
+    receipts.update(fetched_receipts)
+    timestamps.update(fetched_timestamps)
+    return receipts, timestamps
+
+
+def _fetch_receipts_and_blocks(
+    w3: Web3,
+    bucket: TokenBucket,
+    tx_hashes: list[Any],
+    block_numbers: list[int],
+) -> tuple[dict[Any, Any], dict[int, Any]]:
+    """
+    Fetch transaction receipts and blocks using JSON-RPC batch requests.
+    
+    Falls back to concurrent single calls if the endpoint rejects batches.
+    Every HTTP request first takes a token from the endpoint's rate limiter.
+    Items that cannot be fetched are left out of the returned dicts.
+    
+    Args:
+        w3: Connected Web3 instance
+        bucket: Rate limiter for the RPC endpoint
+        tx_hashes: Unique transaction hashes to fetch receipts for
+        block_numbers: Unique block numbers to fetch
+    
+    Returns:
+        Tuple of (receipts keyed by tx hash, blocks keyed by block number)
+    """
+    calls = [(w3.eth.get_transaction_receipt, h) for h in tx_hashes]
+    # Block headers with transaction hashes only; full transaction bodies aren't needed
+    get_block = partial(w3.eth.get_block, full_transactions=False)
+    calls += [(get_block, n) for n in block_numbers]
+    
+    results: list[Any] = []
+    try:
+        for i in range(0, len(calls), MAX_BATCH_SIZE):
+            results.extend(call_rpc(_execute_batch, w3, bucket, calls[i:i + MAX_BATCH_SIZE]))
+    except (Web3Exception, requests.HTTPError) as e:
+        # Some public RPCs reject batches; fetch one by one, concurrently.
+        # Transport and server errors are left to RpcPool to fail over.
+        if not _is_batch_rejection(e):
+            raise
+        results = _fetch_one_by_one(bucket, calls)
+    
+    receipts = dict(zip(tx_hashes, results[:len(tx_hashes)]))
+    blocks = dict(zip(block_numbers, results[len(tx_hashes):]))
+    return (
+        {k: v for k, v in receipts.items() if v is not None},
+        {k: v for k, v in blocks.items() if v is not None},
+    )
+
+
+def _is_batch_rejection(exc: BaseException) -> bool:
+    """Check whether a batch failed because the endpoint refused it, not the network."""
+    if is_transient(exc):
+        return False
+    if isinstance(exc, requests.HTTPError):
+        # 4xx: the endpoint answered but did not accept the batch payload
+        return exc.response is not None and 400 <= exc.response.status_code < 500
+    return isinstance(exc, Web3Exception)
+
+
+def _fetch_one_by_one(bucket: TokenBucket, calls: list[tuple[Any, Any]]) -> list[Any]:
+    """
+    Make each (method, arg) call on its own, concurrently.
+    
+    Calls rejected by the node (e.g. unknown transactions) yield None. Any
+    other error stops the calls that are still queued or retrying and is
+    raised, so RpcPool can fail over to the next endpoint.
+    """
+    results: list[Any] = [None] * len(calls)
+    cancelled = threading.Event()
+    futures = {
+        RPC_EXECUTOR.submit(_rate_limited_call, bucket, method, arg, cancelled): i
+        for i, (method, arg) in enumerate(calls)
+    }
+    for future in as_completed(futures):
+        try:
+            results[futures[future]] = future.result()
+        except Exception as e:
+            if isinstance(e, Web3Exception) and not is_transient(e):
+                continue
+            cancelled.set()
+            for pending in futures:
+                pending.cancel()
+            raise
+    return results
+
+
+def _execute_batch(w3: Web3, bucket: TokenBucket, calls: list[tuple[Any, Any]]) -> list[Any]:
+    """Send a list of (method, arg) calls as one JSON-RPC batch request."""
+    bucket.acquire()
+    with w3.batch_requests() as batch:
+        for method, arg in calls:
+            batch.add(method(arg))
+        return list(batch.execute())
+
+
+def _rate_limited_call(
+    bucket: TokenBucket,
+    method: Any,
+    arg: Any,
+    cancelled: Optional[threading.Event] = None,
+) -> Any:
+    """
+    Make a single RPC call, taking a rate-limit token before each attempt.
+    
+    Once cancelled is set, no further attempts are made.
+    """
+    def attempt() -> Any:
+        if cancelled is not None and cancelled.is_set():
+            raise CancelledError()
+        bucket.acquire()
+        return method(arg)
+    
+    return call_rpc(attempt)
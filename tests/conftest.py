@@ -1,7 +1,14 @@
 """Pytest fixtures for StablePay Verifier tests."""
 
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
 import pytest
 
+from stablepay_verifier.chains import TRANSFER_EVENT_SIGNATURE, address_to_topic
+
 
 @pytest.fixture
 def valid_address() -> str:
@@ -32,3 +39,184 @@ def sample_verify_request(valid_address: str, sample_amount: float):
         token="USDC",
         chain="polygon",
     )
+
+
+class FakeNode:
+    """
+    Minimal JSON-RPC node serving ERC-20 Transfer logs over HTTP.
+    
+    Logs are (block, raw_amount, tx_index) tuples, all sent by SENDER to the
+    receiver in the eth_getLogs filter. Every request is recorded in calls.
+    """
+    
+    SENDER = "0x" + "11" * 20
+    
+    def __init__(self) -> None:
+        self.head = 1000
+        self.logs: list[tuple[int, int, int]] = [
+            (900, 40_000_000, 1),
+            (950, 30_000_000, 2),
+            (950, 30_000_000, 3),
+            (995, 5_000_000, 4),
+        ]
+        self.failed_txs: set[int] = set()  # tx indexes whose receipt has status 0
+        self.reject_batches: str | None = None  # None, "http" or "rpc"
+        # HTTP status returned for single calls to a method, or "batch" for batch requests
+        self.fail_status: dict[str, int] = {}
+        self.calls: list[tuple[str, list[Any]]] = []
+        self.posts = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+        ).start()
+    
+    def count(self, method: str) -> int:
+        """Number of times a JSON-RPC method was called."""
+        return sum(1 for name, _ in self.calls if name == method)
+    
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def _result(self, method: str, params: list[Any]) -> Any:
+        if method == "eth_chainId":
+            return "0x89"
+        if method == "eth_blockNumber":
+            return hex(self.head)
+        if method == "eth_getLogs":
+            flt = params[0]
+            start, end = int(flt["fromBlock"], 16), int(flt["toBlock"], 16)
+            receiver = flt["topics"][2]
+            address = flt["address"]
+            if isinstance(address, list):
+                address = address[0]
+            return [
+                {
+                    "address": address,
+                    "blockHash": f"0x{block:064x}",
+                    "blockNumber": hex(block),
+                    "data": f"0x{amount:064x}",
+                    "logIndex": hex(index),
+                    "removed": False,
+                    "topics": [TRANSFER_EVENT_SIGNATURE, address_to_topic(self.SENDER), receiver],
+                    "transactionHash": self.tx_hash(index),
+                    "transactionIndex": "0x0",
+                }
+                for block, amount, index in self.logs
+                if start <= block <= end
+            ]
+        if method == "eth_getTransactionReceipt":
+            index = int(params[0], 16) - 0xABC000
+            return {
+                "status": "0x0" if index in self.failed_txs else "0x1",
+                "transactionHash": params[0],
+                "blockNumber": "0x1",
+                "blockHash": "0x" + "00" * 32,
+                "logs": [],
+                "cumulativeGasUsed": "0x1",
+                "gasUsed": "0x1",
+                "transactionIndex": "0x0",
+                "from": self.SENDER,
+                "to": self.SENDER,
+                "contractAddress": None,
+                "logsBloom": "0x" + "00" * 256,
+                "effectiveGasPrice": "0x1",
+                "type": "0x2",
+            }
+        if method == "eth_getBlockByNumber":
+            block = int(params[0], 16)
+            return {
+                "number": params[0],
+                "hash": f"0x{block:064x}",
+                "parentHash": "0x" + "00" * 32,
+                "timestamp": hex(self.timestamp(block)),
+                "transactions": [],
+                "miner": self.SENDER,
+                "gasLimit": "0x1",
+                "gasUsed": "0x1",
+                "extraData": "0x",
+                "logsBloom": "0x" + "00" * 256,
+                "size": "0x1",
+            }
+        raise KeyError(method)
+    
+    @staticmethod
+    def tx_hash(index: int) -> str:
+        return f"0x{0xABC000 + index:064x}"
+    
+    @staticmethod
+    def timestamp(block: int) -> int:
+        return 1_700_000_000 + 2 * block
+    
+    def _respond(self, request: dict[str, Any]) -> dict[str, Any]:
+        method, params = request["method"], request.get("params", [])
+        with self._lock:
+            self.calls.append((method, params))
+        try:
+            return {"jsonrpc": "2.0", "id": request["id"], "result": self._result(method, params)}
+        except KeyError:
+            error = {"code": -32601, "message": f"method not found: {method}"}
+            return {"jsonrpc": "2.0", "id": request["id"], "error": error}
+    
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        node = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: Any) -> None:
+                pass
+            
+            def do_POST(self) -> None:
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with node._lock:
+                    node.posts += 1
+                key = "batch" if isinstance(body, list) else body["method"]
+                if key in node.fail_status:
+                    if not isinstance(body, list):
+                        node._respond(body)  # Record the attempt
+                    self._send(node.fail_status[key], b"")
+                    return
+                if isinstance(body, list):
+                    if node.reject_batches == "http":
+                        self._send(400, b"batch requests are not supported")
+                        return
+                    if node.reject_batches == "rpc":
+                        error = {"code": -32600, "message": "batch requests are not supported"}
+                        payload = {"jsonrpc": "2.0", "id": None, "error": error}
+                        self._send(200, json.dumps(payload).encode())
+                        return
+                    response: Any = [node._respond(item) for item in body]
+                else:
+                    response = node._respond(body)
+                self._send(200, json.dumps(response).encode())
+            
+            def _send(self, status: int, data: bytes) -> None:
+                self.send_response(status)
+                self.send_header("Retry-After", "0")
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+        
+        return Handler
+
+
+@pytest.fixture
+def fake_node():
+    """Start a FakeNode, with the verifier's caches cleared around it."""
+    from stablepay_verifier import verifier
+    from stablepay_verifier.rpc import RPC_POOL
+    
+    def clear() -> None:
+        verifier._receipt_cache.clear()
+        verifier._timestamp_cache.clear()
+        verifier._result_cache.clear()
+    
+    clear()
+    node = FakeNode()
+    yield node
+    node.close()
+    clear()
+    # Forget the endpoint so a later node on the same port starts with a closed breaker
+    RPC_POOL._endpoints.pop(node.url, None)
@@ -1,12 +1,22 @@
 """Tests for chain and token configurations."""
 
+from datetime import timedelta
+
+import pytest
+
 from stablepay_verifier.chains import (
     CHAINS,
     TOKENS,
+    TRANSFER_EVENT_SIGNATURE,
+    TRANSFER_EVENT_SIGNATURE_BYTES,
+    address_to_topic,
+    display_chain,
     get_chain_config,
     get_supported_chains,
     get_supported_tokens,
     get_token_config,
+    make_getlogs_params,
+    window_to_block_count,
 )
 
 
@@ -29,6 +39,11 @@ class TestChainConfig:
         """Test unknown chain returns None."""
         assert get_chain_config("unknown") is None
     
+    def test_display_chain(self) -> None:
+        """Test display names come from the chain config."""
+        assert display_chain("arbitrum") == "Arbitrum One"
+        assert display_chain("unknown") == "unknown"
+    
     def test_get_supported_chains(self) -> None:
         """Test getting list of supported chains."""
         chains = get_supported_chains()
@@ -64,6 +79,46 @@ class TestTokenConfig:
         assert "USDT" in tokens
 
 
+class TestWindowToBlockCount:
+    """Tests for window_to_block_count function."""
+    
+    def test_polygon_day(self) -> None:
+        """Test 24h on Polygon (2 second blocks)."""
+        assert window_to_block_count("polygon", "24h") == 43200
+    
+    def test_ethereum_hour(self) -> None:
+        """Test 1h on Ethereum (12 second blocks)."""
+        assert window_to_block_count("ethereum", "1h") == 300
+    
+    def test_parsed_window(self) -> None:
+        """Test an already parsed timedelta gives the same count."""
+        assert window_to_block_count("polygon", timedelta(hours=24)) == 43200
+    
+    def test_unknown_chain(self) -> None:
+        """Test unknown chain raises ValueError."""
+        with pytest.raises(ValueError):
+            window_to_block_count("unknown", "24h")
+
+
+class TestGetLogsPayload:
+    """Tests for eth_getLogs payload builders."""
+    
+    def test_address_to_topic(self, valid_address: str) -> None:
+        """Test addresses are left-padded to 32 bytes."""
+        topic = address_to_topic(valid_address)
+        assert len(topic) == 66
+        assert topic == "0x" + "0" * 24 + valid_address[2:]
+    
+    def test_make_getlogs_params(self, valid_address: str) -> None:
+        """Test filter params for a receiver."""
+        params = make_getlogs_params("0xtoken", 16, 255, valid_address)
+        assert params["fromBlock"] == "0x10"
+        assert params["toBlock"] == "0xff"
+        assert params["topics"][0] == TRANSFER_EVENT_SIGNATURE
+        assert params["topics"][1] is None
+        assert params["topics"][2] == address_to_topic(valid_address)
+
+
 class TestChainData:
     """Tests for chain data integrity."""
     
@@ -73,6 +128,11 @@ class TestChainData:
             assert config.default_rpc, f"{name} missing default RPC"
             assert config.default_rpc.startswith("http")
     
+    def test_all_chains_have_log_range(self) -> None:
+        """Test all chains cap eth_getLogs requests at a positive block count."""
+        for name, config in CHAINS.items():
+            assert config.max_log_range > 0, f"{name} has no log range"
+    
     def test_all_chains_have_tokens(self) -> None:
         """Test all chains have at least one token."""
         for chain in CHAINS:
@@ -85,3 +145,14 @@ class TestChainData:
             token = get_token_config(chain, "USDC")
             assert token is not None, f"USDC missing on {chain}"
             assert token.decimals == 6
+    
+    def test_token_address_bytes(self) -> None:
+        """Test every token address decodes to 20 raw bytes."""
+        for chain, tokens in TOKENS.items():
+            for symbol, token in tokens.items():
+                assert len(token.address_bytes) == 20, f"{symbol} on {chain}"
+                assert token.address_bytes.hex() == token.address[2:].lower()
+    
+    def test_transfer_event_signature_bytes(self) -> None:
+        """Test the Transfer topic is a 32-byte hash."""
+        assert len(TRANSFER_EVENT_SIGNATURE_BYTES) == 32
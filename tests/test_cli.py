@@ -1,8 +1,13 @@
 """Tests for CLI interface."""
 
+import json
+
+import pytest
 from typer.testing import CliRunner
 
+from stablepay_verifier import cli
 from stablepay_verifier.cli import app
+from tests.conftest import FakeNode
 
 runner = CliRunner()
 
@@ -51,3 +56,69 @@ class TestCLI:
         ])
         assert result.exit_code == 10  # EXIT_ERROR
         assert "invalid" in result.stdout.lower() or "error" in result.stdout.lower()
+    
+    def test_verify_invalid_address_json(self) -> None:
+        """Test JSON error output is valid JSON."""
+        result = runner.invoke(app, [
+            "verify",
+            "--address", "invalid",
+            "--amount", "100",
+            "--output", "json",
+        ])
+        assert result.exit_code == 10  # EXIT_ERROR
+        output = json.loads(result.stdout)
+        assert output["status"] == "ERROR"
+        assert output["error_code"] == "INVALID_INPUT"
+    
+    def test_json_error_skips_rich(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test JSON error output never creates the Rich console."""
+        def fail() -> None:
+            raise AssertionError("console created for JSON output")
+        
+        monkeypatch.setattr(cli, "_get_console", fail)
+        result = runner.invoke(app, [
+            "verify",
+            "--address", "invalid",
+            "--amount", "100",
+            "--output", "json",
+        ])
+        assert result.exit_code == 10  # EXIT_ERROR
+        assert json.loads(result.stdout)["error_code"] == "INVALID_INPUT"
+    
+    def test_verify_range_too_large_without_rpc(self) -> None:
+        """Test an oversized window is rejected before contacting the RPC."""
+        result = runner.invoke(app, [
+            "verify",
+            "--address", "0x742d35cc6634c0532925a3b844bc9e7595f3a382",
+            "--amount", "100",
+            "--chain", "arbitrum",
+            "--time-window", "7d",
+            "--rpc", "http://127.0.0.1:9",
+            "--output", "json",
+        ])
+        assert result.exit_code == 10  # EXIT_ERROR
+        assert json.loads(result.stdout)["error_code"] == "RANGE_TOO_LARGE"
+    
+    @pytest.mark.parametrize(
+        ("logs", "exit_code"),
+        [
+            ([(900, 50_000, 1)], 2),  # EXIT_PARTIAL
+            ([(900, 50_000, 1), (995, 100_000_000, 2)], 2),  # Dust plus a pending payment
+            ([(900, 100_000_000, 1)], 0),  # EXIT_PAID
+            ([], 1),  # EXIT_NOT_PAID
+        ],
+    )
+    def test_quiet_matches_full_output(
+        self, fake_node: FakeNode, logs: list[tuple[int, int, int]], exit_code: int
+    ) -> None:
+        """Test the exit code does not depend on how much is printed."""
+        fake_node.logs = logs
+        args = [
+            "verify",
+            "--address", "0x742d35cc6634c0532925a3b844bc9e7595f3a382",
+            "--amount", "100",
+            "--rpc", fake_node.url,
+            "--min-confirmations", "10",
+        ]
+        results = [runner.invoke(app, args + extra) for extra in ([], ["--quiet"])]
+        assert [result.exit_code for result in results] == [exit_code, exit_code]
@@ -1,7 +1,9 @@
-"""Tests for Pydantic models."""
+"""Tests for data models."""
+
+import json
+from datetime import datetime, timedelta, timezone
 
 import pytest
-from pydantic import ValidationError
 
 from stablepay_verifier.models import (
     PaymentResult,
@@ -24,10 +26,12 @@ class TestVerifyRequest:
         assert request.amount == 100.0
         assert request.token == "USDC"
         assert request.chain == "polygon"
+        assert request.verify_receipts is False
+        assert request.return_transfers is True
     
     def test_address_validation_invalid_format(self) -> None:
         """Test address validation with invalid format."""
-        with pytest.raises(ValidationError):
+        with pytest.raises(ValueError):
             VerifyRequest(
                 address="invalid",
                 amount=100.0,
@@ -35,7 +39,7 @@ class TestVerifyRequest:
     
     def test_address_validation_wrong_length(self) -> None:
         """Test address validation with wrong length."""
-        with pytest.raises(ValidationError):
+        with pytest.raises(ValueError):
             VerifyRequest(
                 address="0x123",
                 amount=100.0,
@@ -43,7 +47,7 @@ class TestVerifyRequest:
     
     def test_address_validation_non_hex(self) -> None:
         """Test address validation with non-hex characters."""
-        with pytest.raises(ValidationError):
+        with pytest.raises(ValueError):
             VerifyRequest(
                 address="0xGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGG",
                 amount=100.0,
@@ -51,13 +55,13 @@ class TestVerifyRequest:
     
     def test_amount_must_be_positive(self, valid_address: str) -> None:
         """Test that amount must be positive."""
-        with pytest.raises(ValidationError):
+        with pytest.raises(ValueError):
             VerifyRequest(
                 address=valid_address,
                 amount=0,
             )
         
-        with pytest.raises(ValidationError):
+        with pytest.raises(ValueError):
             VerifyRequest(
                 address=valid_address,
                 amount=-10,
@@ -92,14 +96,30 @@ class TestVerifyRequest:
             )
             assert request.time_window == window
         
+        request = VerifyRequest(
+            address=valid_address,
+            amount=100.0,
+            time_window="7D",
+        )
+        assert request.time_window_td == timedelta(days=7)
+        
         # Invalid formats
-        with pytest.raises(ValidationError):
+        with pytest.raises(ValueError):
             VerifyRequest(
                 address=valid_address,
                 amount=100.0,
                 time_window="invalid",
             )
     
+    def test_min_confirmations_non_negative(self, valid_address: str) -> None:
+        """Test min_confirmations cannot be negative."""
+        with pytest.raises(ValueError):
+            VerifyRequest(
+                address=valid_address,
+                amount=100.0,
+                min_confirmations=-1,
+            )
+    
     def test_tolerance_bounds(self, valid_address: str) -> None:
         """Test tolerance must be between 0 and 1."""
         # Valid tolerance
@@ -111,7 +131,7 @@ class TestVerifyRequest:
         assert request.tolerance == 0.05
         
         # Invalid tolerance
-        with pytest.raises(ValidationError):
+        with pytest.raises(ValueError):
             VerifyRequest(
                 address=valid_address,
                 amount=100.0,
@@ -119,6 +139,21 @@ class TestVerifyRequest:
             )
 
 
+class TestPaymentStatus:
+    """Tests for PaymentStatus enum."""
+    
+    def test_values_match_exit_codes(self) -> None:
+        """Test status values line up with the documented exit codes."""
+        assert int(PaymentStatus.PAID) == 0
+        assert int(PaymentStatus.NOT_PAID) == 1
+        assert int(PaymentStatus.PARTIAL) == 2
+        assert int(PaymentStatus.PENDING) == 3
+    
+    def test_str_is_label(self) -> None:
+        """Test str() returns the status label."""
+        assert str(PaymentStatus.NOT_PAID) == "NOT_PAID"
+
+
 class TestPaymentResult:
     """Tests for PaymentResult model."""
     
@@ -160,6 +195,20 @@ class TestPaymentResult:
             chain="polygon",
         )
         assert result.shortfall == 0.0
+    
+    def test_json_status_is_name(self, valid_address: str) -> None:
+        """Test JSON output labels the status by name and round-trips."""
+        result = PaymentResult(
+            status=PaymentStatus.PARTIAL,
+            expected_amount=100.0,
+            receiver=valid_address,
+            token="USDC",
+            chain="polygon",
+        )
+        data = result.model_dump_json()
+        assert json.loads(data)["status"] == "PARTIAL"
+        assert result.model_dump()["status"] is PaymentStatus.PARTIAL
+        assert PaymentResult.model_validate_json(data).status is PaymentStatus.PARTIAL
 
 
 class TestTransfer:
@@ -178,3 +227,19 @@ class TestTransfer:
         )
         assert transfer.amount == 100.0
         assert transfer.confirmations == 50
+    
+    def test_transfer_to_dict(self, valid_address: str) -> None:
+        """Test transfer serializes to a JSON-ready dict."""
+        transfer = Transfer(
+            tx_hash="0x" + "a" * 64,
+            block_number=12345678,
+            sender=valid_address,
+            receiver=valid_address,
+            amount=100.0,
+            raw_amount=100000000,
+            timestamp=datetime(2024, 1, 15, tzinfo=timezone.utc),
+        )
+        data = transfer.to_dict()
+        assert data["raw_amount"] == 100000000
+        assert data["timestamp"] == "2024-01-15T00:00:00+00:00"
+        json.dumps(data)
@@ -0,0 +1,218 @@
+"""Tests for RPC helpers."""
+
+import threading
+import time
+from typing import Any
+
+import pytest
+import requests
+
+from stablepay_verifier import rpc
+from stablepay_verifier.rpc import (
+    OPEN,
+    POOL_MAXSIZE,
+    RPC_EXECUTOR,
+    Endpoint,
+    RpcPool,
+    RpcUnavailableError,
+    TokenBucket,
+    call_rpc,
+    get_rate_limiter,
+    is_retryable,
+    is_transient,
+    make_session,
+    make_web3,
+)
+from tests.conftest import FakeNode
+
+
+def _http_error(status: int, retry_after: str = "0") -> requests.HTTPError:
+    """Build an HTTPError as raised by requests for a given status code."""
+    response = requests.Response()
+    response.status_code = status
+    response.headers["Retry-After"] = retry_after
+    return requests.HTTPError(f"{status} error", response=response)
+
+
+class TestTokenBucket:
+    """Tests for the TokenBucket rate limiter."""
+    
+    def test_burst_is_immediate(self) -> None:
+        """Test requests within the burst size do not wait."""
+        bucket = TokenBucket(rate=1.0, burst=5)
+        start = time.monotonic()
+        for _ in range(5):
+            bucket.acquire()
+        assert time.monotonic() - start < 0.5
+    
+    def test_throttles_after_burst(self) -> None:
+        """Test requests beyond the burst wait for tokens to refill."""
+        bucket = TokenBucket(rate=20.0, burst=1)
+        bucket.acquire()
+        start = time.monotonic()
+        bucket.acquire()
+        assert time.monotonic() - start >= 0.04
+
+
+class TestGetRateLimiter:
+    """Tests for get_rate_limiter function."""
+    
+    def test_shared_per_endpoint(self) -> None:
+        """Test the same endpoint always gets the same bucket."""
+        assert get_rate_limiter("https://a.example") is get_rate_limiter("https://a.example")
+        assert get_rate_limiter("https://a.example") is not get_rate_limiter("https://b.example")
+
+
+class TestMakeSession:
+    """Tests for make_session function."""
+    
+    def test_pool_size(self) -> None:
+        """Test both schemes use a connection pool sized for the RPC workers."""
+        session = make_session()
+        for prefix in ("https://", "http://"):
+            assert session.get_adapter(prefix + "rpc.example")._pool_maxsize == POOL_MAXSIZE
+    
+    def test_executor_threads_use_endpoint_session(
+        self, monkeypatch: pytest.MonkeyPatch, fake_node: FakeNode
+    ) -> None:
+        """Test calls made from RPC_EXECUTOR workers go through the pooled session."""
+        session = make_session()
+        used: list[int] = []
+        send = session.send
+        
+        def spy(request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+            used.append(threading.get_ident())
+            return send(request, **kwargs)
+        
+        session.send = spy  # type: ignore[method-assign]
+        monkeypatch.setattr(rpc, "make_session", lambda: session)
+        w3 = make_web3(fake_node.url)
+        assert RPC_EXECUTOR.submit(w3.eth.get_block_number).result() == fake_node.head
+        assert len(used) == 1
+        assert used[0] != threading.get_ident()
+
+
+class TestCallRpc:
+    """Tests for call_rpc retry behavior."""
+    
+    def test_is_transient(self) -> None:
+        """Test which errors are classified as transient."""
+        assert is_transient(_http_error(429))
+        assert is_transient(_http_error(503))
+        assert is_transient(requests.Timeout())
+        assert not is_transient(_http_error(400))
+        assert not is_transient(ValueError("boom"))
+    
+    def test_timeouts_are_not_retried(self) -> None:
+        """Test timeouts are raised at once, for the pool to fail over."""
+        attempts = []
+        
+        def hung() -> None:
+            attempts.append(1)
+            raise requests.ReadTimeout()
+        
+        assert not is_retryable(requests.ReadTimeout())
+        assert is_retryable(_http_error(503))
+        with pytest.raises(requests.ReadTimeout):
+            call_rpc(hung)
+        assert len(attempts) == 1
+    
+    def test_retries_transient_errors(self) -> None:
+        """Test transient errors are retried until the call succeeds."""
+        attempts = []
+        
+        def flaky() -> str:
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise _http_error(429)
+            return "ok"
+        
+        assert call_rpc(flaky) == "ok"
+        assert len(attempts) == 3
+    
+    def test_non_transient_raises_immediately(self) -> None:
+        """Test non-transient errors are not retried."""
+        attempts = []
+        
+        def broken() -> None:
+            attempts.append(1)
+            raise _http_error(400)
+        
+        with pytest.raises(requests.HTTPError):
+            call_rpc(broken)
+        assert len(attempts) == 1
+
+
+class TestRpcPool:
+    """Tests for RpcPool circuit breakers and failover."""
+    
+    URLS = ["http://primary.invalid", "http://backup.invalid"]
+    
+    def _call(self, calls: list[str]):
+        """Build a call that fails on the primary and succeeds on the backup."""
+        def call(endpoint: Endpoint) -> str:
+            calls.append(endpoint.url)
+            if endpoint.url == self.URLS[0]:
+                raise requests.ConnectionError("connection refused")
+            return endpoint.url
+        return call
+    
+    def test_fails_over_to_next_endpoint(self) -> None:
+        """Test a transient failure moves on to the next URL."""
+        calls: list[str] = []
+        pool = RpcPool()
+        assert pool.execute(self.URLS, self._call(calls)) == self.URLS[1]
+        assert calls == self.URLS
+    
+    def test_timeout_fails_over_without_retry(self) -> None:
+        """Test a timed-out endpoint is tried once before moving on."""
+        calls: list[str] = []
+        pool = RpcPool()
+        
+        def rpc(url: str) -> str:
+            calls.append(url)
+            if url == self.URLS[0]:
+                raise requests.ReadTimeout("read timed out")
+            return url
+        
+        result = pool.execute(self.URLS, lambda endpoint: call_rpc(rpc, endpoint.url))
+        assert result == self.URLS[1]
+        assert calls == self.URLS
+    
+    def test_breaker_opens_after_threshold(self) -> None:
+        """Test an endpoint is skipped once its breaker opens."""
+        calls: list[str] = []
+        pool = RpcPool(failure_threshold=2)
+        for _ in range(3):
+            pool.execute(self.URLS, self._call(calls))
+        assert calls.count(self.URLS[0]) == 2
+        assert pool.get_endpoint(self.URLS[0]).state == OPEN
+    
+    def test_breaker_half_opens_after_cooldown(self) -> None:
+        """Test an open endpoint is retried after its cooldown, which then doubles."""
+        calls: list[str] = []
+        pool = RpcPool(failure_threshold=1, cooldown=0.01)
+        pool.execute(self.URLS, self._call(calls))
+        time.sleep(0.02)
+        pool.execute(self.URLS, self._call(calls))
+        assert calls.count(self.URLS[0]) == 2
+        assert pool.get_endpoint(self.URLS[0]).cooldown == 0.02
+    
+    def test_non_transient_error_is_raised(self) -> None:
+        """Test non-transient errors do not trigger failover."""
+        pool = RpcPool()
+        
+        def call(endpoint: Endpoint) -> None:
+            raise ValueError("bad params")
+        
+        with pytest.raises(ValueError):
+            pool.execute(self.URLS, call)
+    
+    def test_all_endpoints_open(self) -> None:
+        """Test RpcUnavailableError when every breaker is open."""
+        calls: list[str] = []
+        pool = RpcPool(failure_threshold=1)
+        with pytest.raises(requests.ConnectionError):
+            pool.execute(self.URLS[:1], self._call(calls))
+        with pytest.raises(RpcUnavailableError):
+            pool.execute(self.URLS[:1], self._call(calls))
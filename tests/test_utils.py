@@ -1,17 +1,20 @@
 """Tests for utility functions."""
 
-from datetime import timedelta
+from datetime import timedelta, timezone
 
 import pytest
 
 from stablepay_verifier.utils import (
     calculate_tolerance_range,
+    calculate_tolerance_range_wei,
     estimate_blocks_from_time,
     format_address,
     format_amount,
+    get_utc_now,
     is_valid_address,
     parse_time_window,
     token_to_wei,
+    utc_now_seconds,
     wei_to_token,
 )
 
@@ -51,6 +54,10 @@ class TestParseTimeWindow:
         
         with pytest.raises(ValueError):
             parse_time_window("h24")
+    
+    def test_result_is_cached(self) -> None:
+        """Test repeat windows reuse the parsed timedelta."""
+        assert parse_time_window("12h") is parse_time_window("12h")
 
 
 class TestEstimateBlocks:
@@ -61,6 +68,10 @@ class TestEstimateBlocks:
         # 1 hour with 2 second blocks = 1800 blocks
         assert estimate_blocks_from_time(timedelta(hours=1), 2.0) == 1800
     
+    def test_sub_second_block_time(self) -> None:
+        """Test chains with sub-second blocks (e.g. Arbitrum)."""
+        assert estimate_blocks_from_time(timedelta(hours=24), 0.25) == 345600
+    
     def test_minimum_one_block(self) -> None:
         """Test minimum is 1 block."""
         assert estimate_blocks_from_time(timedelta(seconds=0.1), 2.0) == 1
@@ -93,6 +104,12 @@ class TestFormatAmount:
         """Test custom decimal places."""
         assert format_amount(100.123, 1) == "100.1"
         assert format_amount(100.123, 4) == "100.1230"
+    
+    def test_signed_zero(self) -> None:
+        """Test the cache does not mix up 0.0 and -0.0."""
+        assert format_amount(-0.0) == "-0.00"
+        assert format_amount(0.0) == "0.00"
+        assert format_amount(-0.0) == "-0.00"
 
 
 class TestWeiConversion:
@@ -108,6 +125,10 @@ class TestWeiConversion:
         # 1 DAI = 10^18 wei
         assert wei_to_token(10**18, 18) == 1.0
     
+    def test_token_to_wei_no_float_rounding(self) -> None:
+        """Test token to wei does not lose cents to float rounding."""
+        assert token_to_wei(1.13, 2) == 113
+    
     def test_token_to_wei_usdc(self) -> None:
         """Test token to wei for USDC."""
         assert token_to_wei(100.0, 6) == 100_000_000
@@ -132,6 +153,20 @@ class TestIsValidAddress:
         assert not is_valid_address("invalid")
         assert not is_valid_address("0x123")
         assert not is_valid_address("742d35cc6634c0532925a3b844bc9e7595f3a382")
+        assert not is_valid_address("0x" + "g" * 40)
+        assert not is_valid_address("0x" + "é" * 40)
+
+
+class TestUtcNow:
+    """Tests for current-time helpers."""
+    
+    def test_get_utc_now_is_aware(self) -> None:
+        """Test get_utc_now returns a UTC-aware datetime."""
+        assert get_utc_now().tzinfo == timezone.utc
+    
+    def test_utc_now_seconds_matches_datetime(self) -> None:
+        """Test both helpers agree on the current time."""
+        assert abs(utc_now_seconds() - get_utc_now().timestamp()) < 5
 
 
 class TestToleranceRange:
@@ -148,3 +183,11 @@ class TestToleranceRange:
         min_val, max_val = calculate_tolerance_range(100.0, 0.05)
         assert min_val == 95.0
         assert max_val == 105.0
+    
+    def test_wei_tolerance(self) -> None:
+        """Test 1% tolerance on 100 USDC in smallest units."""
+        assert calculate_tolerance_range_wei(100_000_000, 10_000) == (99_000_000, 101_000_000)
+    
+    def test_wei_tolerance_zero(self) -> None:
+        """Test zero tolerance requires the exact amount."""
+        assert calculate_tolerance_range_wei(1, 0) == (1, 1)
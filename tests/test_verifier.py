@@ -0,0 +1,408 @@
+"""Tests for the payment verification logic."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any
+
+import pytest
+import requests
+from hexbytes import HexBytes
+from web3.exceptions import TransactionNotFound
+
+from stablepay_verifier import verifier
+from stablepay_verifier.chains import TRANSFER_EVENT_SIGNATURE, address_to_topic
+from stablepay_verifier.models import PaymentResult, PaymentStatus, Transfer, VerifyRequest
+from stablepay_verifier.rpc import RPC_POOL, TokenBucket
+from stablepay_verifier.verifier import (
+    VerificationError,
+    _fetch_one_by_one,
+    _fetch_receipts_and_blocks,
+    _get_logs,
+    _is_transfer_to,
+    verify_payment,
+    verify_payment_async,
+)
+from tests.conftest import FakeNode
+
+
+class TestResultCache:
+    """Tests for the short-lived PAID result cache."""
+    
+    @pytest.fixture(autouse=True)
+    def clear_cache(self) -> None:
+        """Start every test with an empty cache."""
+        verifier._result_cache.clear()
+    
+    def _fake_verify(self, status: PaymentStatus, calls: list[VerifyRequest]):
+        def fake(request: VerifyRequest) -> PaymentResult:
+            calls.append(request)
+            return PaymentResult(
+                status=status,
+                expected_amount=request.amount,
+                receiver=request.address,
+                token=request.token,
+                chain=request.chain,
+                transfers=[Transfer(
+                    tx_hash=FakeNode.tx_hash(1),
+                    block_number=900,
+                    sender=FakeNode.SENDER,
+                    receiver=request.address,
+                    amount=request.amount,
+                    raw_amount=round(request.amount * 1_000_000),
+                )],
+            )
+        return fake
+    
+    def test_paid_is_cached(
+        self, monkeypatch: pytest.MonkeyPatch, sample_verify_request: VerifyRequest
+    ) -> None:
+        """Test an identical request within the TTL reuses a PAID result."""
+        calls: list[VerifyRequest] = []
+        monkeypatch.setattr(
+            verifier, "_verify_payment", self._fake_verify(PaymentStatus.PAID, calls)
+        )
+        first = verify_payment(sample_verify_request)
+        second = verify_payment(sample_verify_request)
+        assert len(calls) == 1
+        assert second == first
+        assert second is not first
+    
+    def test_cached_result_is_not_shared(
+        self, monkeypatch: pytest.MonkeyPatch, sample_verify_request: VerifyRequest
+    ) -> None:
+        """Test mutating a returned result does not change the cached one."""
+        monkeypatch.setattr(
+            verifier, "_verify_payment", self._fake_verify(PaymentStatus.PAID, [])
+        )
+        first = verify_payment(sample_verify_request)
+        first.transfers[0].amount = 999.0
+        first.transfers.append(first.transfers[0])
+        second = verify_payment(sample_verify_request)
+        second.transfers[0].amount = 998.0
+        third = verify_payment(sample_verify_request)
+        assert len(third.transfers) == 1
+        assert third.transfers[0].amount == sample_verify_request.amount
+    
+    @pytest.mark.parametrize(
+        "status",
+        [PaymentStatus.NOT_PAID, PaymentStatus.PARTIAL, PaymentStatus.PENDING],
+    )
+    def test_unpaid_is_not_cached(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        sample_verify_request: VerifyRequest,
+        status: PaymentStatus,
+    ) -> None:
+        """Test results that can still change are always re-verified."""
+        calls: list[VerifyRequest] = []
+        monkeypatch.setattr(verifier, "_verify_payment", self._fake_verify(status, calls))
+        verify_payment(sample_verify_request)
+        verify_payment(sample_verify_request)
+        assert len(calls) == 2
+
+
+class TestIsTransferTo:
+    """Tests for the client-side log filter."""
+    
+    TOKEN = "0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359"
+    
+    def _log(self, receiver: str, address: str = TOKEN, topic0: str = TRANSFER_EVENT_SIGNATURE):
+        return {
+            "address": address,
+            "topics": [
+                HexBytes(topic0),
+                HexBytes(address_to_topic("0x" + "11" * 20)),
+                HexBytes(address_to_topic(receiver)),
+            ],
+        }
+    
+    def _check(self, log, receiver: str) -> bool:
+        return _is_transfer_to(log, bytes.fromhex(self.TOKEN[2:]), bytes.fromhex(receiver[2:]))
+    
+    def test_matching_log(self, valid_address: str) -> None:
+        """Test a Transfer from the token to the receiver is kept."""
+        assert self._check(self._log(valid_address), valid_address)
+    
+    def test_other_receiver(self, valid_address: str) -> None:
+        """Test transfers to another address are dropped."""
+        assert not self._check(self._log("0x" + "22" * 20), valid_address)
+    
+    def test_other_contract(self, valid_address: str) -> None:
+        """Test look-alike tokens from another contract are dropped."""
+        log = self._log(valid_address, address="0x" + "33" * 20)
+        assert not self._check(log, valid_address)
+    
+    def test_other_event(self, valid_address: str) -> None:
+        """Test events with a different signature are dropped."""
+        log = self._log(valid_address, topic0="0x" + "44" * 32)
+        assert not self._check(log, valid_address)
+
+
+def _request(node: FakeNode, **kwargs: Any) -> VerifyRequest:
+    """Build a request against a FakeNode for the default test receiver."""
+    kwargs.setdefault("amount", 100.0)
+    return VerifyRequest(
+        address="0x742d35cc6634c0532925a3b844bc9e7595f3a382", rpc=node.url, **kwargs
+    )
+
+
+class TestVerifyPayment:
+    """Tests for verify_payment against a local JSON-RPC node."""
+    
+    def test_paid_with_transfers(self, fake_node: FakeNode) -> None:
+        """Test a covered payment returns the latest confirmed transfer and all transfers."""
+        result = verify_payment(_request(fake_node))
+        assert result.status == PaymentStatus.PAID
+        assert result.matched_amount == 100.0
+        assert result.transaction_hash == FakeNode.tx_hash(2)
+        assert result.block_number == 950
+        assert result.confirmations == 50
+        assert result.timestamp == datetime.fromtimestamp(
+            FakeNode.timestamp(950), tz=timezone.utc
+        )
+        assert result.sender == FakeNode.SENDER
+        assert [t.block_number for t in result.transfers] == [900, 950, 950, 995]
+        # The pending transfer has no timestamp, since its block is not fetched
+        assert result.transfers[-1].timestamp is None
+        assert fake_node.count("eth_getBlockByNumber") == 2
+    
+    def test_paid_status_only(self, fake_node: FakeNode) -> None:
+        """Test return_transfers=False reports the same payment without the list."""
+        result = verify_payment(_request(fake_node, return_transfers=False))
+        assert result.status == PaymentStatus.PAID
+        assert result.matched_amount == 100.0
+        assert result.transaction_hash == FakeNode.tx_hash(2)
+        assert result.block_number == 950
+        assert result.transfers == []
+        # Only the latest transfer's block is fetched
+        assert fake_node.count("eth_getBlockByNumber") == 1
+    
+    @pytest.mark.parametrize("return_transfers", [True, False])
+    @pytest.mark.parametrize(
+        ("kwargs", "status", "matched"),
+        [
+            ({"amount": 500.0}, PaymentStatus.PARTIAL, 100.0),
+            ({"min_confirmations": 500}, PaymentStatus.PENDING, 0.0),
+            ({"from_block": 0, "to_block": 800}, PaymentStatus.NOT_PAID, 0.0),
+        ],
+    )
+    def test_status(
+        self,
+        fake_node: FakeNode,
+        return_transfers: bool,
+        kwargs: dict[str, Any],
+        status: PaymentStatus,
+        matched: float,
+    ) -> None:
+        """Test both return_transfers modes agree on status and matched amount."""
+        result = verify_payment(_request(fake_node, return_transfers=return_transfers, **kwargs))
+        assert result.status == status
+        assert result.matched_amount == matched
+    
+    @pytest.mark.parametrize("verify_receipts", [False, True])
+    @pytest.mark.parametrize(
+        ("logs", "status"),
+        [
+            ([(900, 50_000, 1)], PaymentStatus.PARTIAL),
+            ([(900, 50_000, 1), (995, 100_000_000, 2)], PaymentStatus.PARTIAL),
+            ([(900, 60_000_000, 1), (990, 40_000_000, 2), (980, 50_000, 3)], PaymentStatus.PAID),
+            ([(900, 60_000_000, 1), (950, 40_000_000, 2), (990, 50_000, 3)], PaymentStatus.PAID),
+        ],
+    )
+    def test_dust_counts_in_both_modes(
+        self,
+        fake_node: FakeNode,
+        verify_receipts: bool,
+        logs: list[tuple[int, int, int]],
+        status: PaymentStatus,
+    ) -> None:
+        """Test dust transfers change the status the same way with and without transfers."""
+        fake_node.logs = logs
+        full, status_only = (
+            verify_payment(_request(
+                fake_node, min_confirmations=10,
+                verify_receipts=verify_receipts, return_transfers=return_transfers,
+            ))
+            for return_transfers in (True, False)
+        )
+        assert full.status == status_only.status == status
+        assert full.transaction_hash == status_only.transaction_hash
+        assert full.block_number == status_only.block_number
+        assert full.timestamp == status_only.timestamp
+        if status != PaymentStatus.PAID:
+            assert full.matched_amount == status_only.matched_amount
+    
+    def test_older_dust_receipts_skipped_once_paid(self, fake_node: FakeNode) -> None:
+        """Test dust older than the covering transfers has no receipt fetched."""
+        fake_node.logs = [(900, 50_000, 1), (950, 60_000_000, 2), (960, 40_000_000, 3)]
+        result = verify_payment(_request(
+            fake_node, min_confirmations=10, verify_receipts=True, return_transfers=False
+        ))
+        assert result.status == PaymentStatus.PAID
+        assert result.transaction_hash == FakeNode.tx_hash(3)
+        assert fake_node.count("eth_getTransactionReceipt") == 2
+    
+    def test_log_filter(self, fake_node: FakeNode, valid_address: str) -> None:
+        """Test eth_getLogs is sent the token, receiver and sender topics."""
+        verify_payment(_request(fake_node, sender=FakeNode.SENDER))
+        [(_, [params])] = [call for call in fake_node.calls if call[0] == "eth_getLogs"]
+        assert params["address"] == ["0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359"]
+        assert params["topics"] == [
+            TRANSFER_EVENT_SIGNATURE,
+            address_to_topic(FakeNode.SENDER),
+            address_to_topic(valid_address),
+        ]
+    
+    def test_receipts_skipped_by_default(self, fake_node: FakeNode) -> None:
+        """Test receipts are only fetched when verify_receipts is set."""
+        verify_payment(_request(fake_node))
+        assert fake_node.count("eth_getTransactionReceipt") == 0
+    
+    @pytest.mark.parametrize("return_transfers", [True, False])
+    def test_failed_receipt_is_excluded(
+        self, fake_node: FakeNode, return_transfers: bool
+    ) -> None:
+        """Test verify_receipts drops transfers whose transaction failed."""
+        fake_node.failed_txs = {2}
+        result = verify_payment(_request(
+            fake_node, verify_receipts=True, return_transfers=return_transfers
+        ))
+        assert result.status == PaymentStatus.PARTIAL
+        assert result.matched_amount == 70.0
+        assert result.transaction_hash == FakeNode.tx_hash(3)
+    
+    @pytest.mark.parametrize("mode", ["http", "rpc"])
+    def test_batch_rejected_falls_back_to_single_calls(
+        self, fake_node: FakeNode, mode: str
+    ) -> None:
+        """Test receipts and blocks are fetched one by one when batches are rejected."""
+        fake_node.reject_batches = mode
+        result = verify_payment(_request(fake_node, verify_receipts=True))
+        assert result.status == PaymentStatus.PAID
+        assert result.transaction_hash == FakeNode.tx_hash(2)
+        assert fake_node.count("eth_getTransactionReceipt") == 3
+        assert fake_node.count("eth_getBlockByNumber") == 2
+    
+    def test_batch_server_error_is_not_retried_one_by_one(self, fake_node: FakeNode) -> None:
+        """Test a failing endpoint is reported instead of being hit with single calls."""
+        fake_node.fail_status = {"batch": 503}
+        with pytest.raises(VerificationError) as exc_info:
+            verify_payment(_request(fake_node, verify_receipts=True))
+        assert exc_info.value.code == "RPC_ERROR"
+        assert fake_node.count("eth_getTransactionReceipt") == 0
+    
+    def test_block_timestamps_are_cached(self, fake_node: FakeNode) -> None:
+        """Test block timestamps are reused by later verifications."""
+        verify_payment(_request(fake_node))
+        result = verify_payment(_request(fake_node, amount=99.0))
+        assert result.timestamp is not None
+        assert fake_node.count("eth_getBlockByNumber") == 2
+    
+    def test_async(self, fake_node: FakeNode) -> None:
+        """Test verify_payment_async returns the same result."""
+        result = asyncio.run(verify_payment_async(_request(fake_node)))
+        assert result.status == PaymentStatus.PAID
+        assert result.transaction_hash == FakeNode.tx_hash(2)
+
+
+class TestFetchOneByOne:
+    """Tests for the single-call fallback used when batches are rejected."""
+    
+    def _unavailable(self) -> requests.HTTPError:
+        response = requests.Response()
+        response.status_code = 503
+        response.headers["Retry-After"] = "0"
+        return requests.HTTPError(response=response)
+    
+    def test_node_errors_yield_none(self) -> None:
+        """Test calls the node rejects are left out without failing the rest."""
+        def get(arg: int) -> int:
+            if arg == 2:
+                raise TransactionNotFound("not found")
+            return arg
+        
+        calls = [(get, 1), (get, 2), (get, 3)]
+        assert _fetch_one_by_one(TokenBucket(100, 100), calls) == [1, None, 3]
+    
+    def test_transport_error_stops_other_calls(self) -> None:
+        """Test a transport error is raised and the remaining calls stop retrying."""
+        release = threading.Event()
+        attempts: list[int] = []
+        
+        def fail(arg: int) -> int:
+            raise self._unavailable()
+        
+        def slow(arg: int) -> int:
+            attempts.append(arg)
+            release.wait(5)
+            raise self._unavailable()
+        
+        calls = [(slow, 1), (slow, 2), (fail, 3)]
+        with pytest.raises(requests.HTTPError):
+            _fetch_one_by_one(TokenBucket(100, 100), calls)
+        release.set()
+        time.sleep(0.1)
+        assert sorted(attempts) == [1, 2]
+
+
+class TestConcurrentBatches:
+    """Tests for batch requests sharing one endpoint client across threads."""
+    
+    def test_threads_get_their_own_results(self, fake_node: FakeNode) -> None:
+        """Test batches and single calls on a shared client do not mix up calls."""
+        endpoint = RPC_POOL.get_endpoint(fake_node.url)
+        barrier = threading.Barrier(8)
+        
+        def fetch(worker: int) -> None:
+            barrier.wait()
+            tx_hashes = [FakeNode.tx_hash(worker * 10 + i) for i in range(5)]
+            blocks = [worker * 10 + i for i in range(5)]
+            for _ in range(20):
+                if worker % 2:
+                    # Single calls made while another thread is batching are still sent
+                    assert endpoint.w3.eth.get_block_number() == fake_node.head
+                    continue
+                receipts, headers = _fetch_receipts_and_blocks(
+                    endpoint.w3, TokenBucket(1000, 1000), tx_hashes, blocks
+                )
+                assert [receipts[h]["transactionHash"].to_0x_hex() for h in tx_hashes] == tx_hashes
+                assert [headers[n]["number"] for n in blocks] == blocks
+        
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(fetch, range(8)))
+        # Every batch went out as a batch, none fell back to single calls
+        assert fake_node.count("eth_getTransactionReceipt") == 4 * 20 * 5
+        assert fake_node.posts == 4 * 20 + 4 * 20
+
+
+class TestGetLogs:
+    """Tests for chunked eth_getLogs fetching."""
+    
+    def test_chunks_are_contiguous(self, fake_node: FakeNode, valid_address: str) -> None:
+        """Test chunks cover the range exactly once and logs stay in block order."""
+        endpoint = RPC_POOL.get_endpoint(fake_node.url)
+        log_filter = {
+            "address": "0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359",
+            "topics": [TRANSFER_EVENT_SIGNATURE, None, address_to_topic(valid_address)],
+        }
+        logs = _get_logs(endpoint.w3, endpoint.bucket, log_filter, 10, 1000, 300)
+        
+        ranges = sorted(
+            (int(params[0]["fromBlock"], 16), int(params[0]["toBlock"], 16))
+            for method, params in fake_node.calls if method == "eth_getLogs"
+        )
+        assert ranges == [(10, 309), (310, 609), (610, 909), (910, 1000)]
+        assert [log["blockNumber"] for log in logs] == [900, 950, 950, 995]
+    
+    def test_single_chunk(self, fake_node: FakeNode, valid_address: str) -> None:
+        """Test a range within max_range is fetched with one request."""
+        endpoint = RPC_POOL.get_endpoint(fake_node.url)
+        log_filter = {
+            "address": "0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359",
+            "topics": [TRANSFER_EVENT_SIGNATURE, None, address_to_topic(valid_address)],
+        }
+        assert len(_get_logs(endpoint.w3, endpoint.bucket, log_filter, 0, 1000, 2000)) == 4
+        assert fake_node.count("eth_getLogs") == 1